@@ -1,6 +1,15 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .cache import create_cache_table
+        # post_migrate отправляется только приложениям с моделями.
+        post_migrate.connect(
+            create_cache_table, sender=apps.get_app_config('reviews')
+        )
@@ -0,0 +1,239 @@
+from collections import defaultdict
+
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from reviews.changes import log_changes
+from reviews.constants import MAX_BULK_SIZE
+from reviews.models import Category, Change, Genre, Title
+from .cache import bump_titles_version
+
+BATCH_SIZE = 500
+
+
+def check_bulk_items(items):
+    if not isinstance(items, list):
+        raise ValidationError('Expected a list of objects.')
+    if not items:
+        raise ValidationError('The list of objects is empty.')
+    if len(items) > MAX_BULK_SIZE:
+        raise ValidationError(
+            f'No more than {MAX_BULK_SIZE} objects per request.'
+        )
+
+
+def collect_slugs(items, key):
+    slugs = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        values = item.get(key)
+        if isinstance(values, (str, int)):
+            values = (values,)
+        if isinstance(values, (list, tuple)):
+            slugs.update(str(value) for value in values
+                         if isinstance(value, (str, int)))
+    return slugs
+
+
+def load_known_objects(items):
+    """Загружает все упомянутые жанры и категории двумя запросами."""
+
+    return {
+        model: model.objects.in_bulk(collect_slugs(items, key),
+                                     field_name='slug')
+        for model, key in ((Genre, 'genre'), (Category, 'category'))
+    }
+
+
+def validate_bulk_items(serializer_class, items, context):
+    """Проверяет каждый объект сериализатором.
+
+    Возвращает проверенные данные и список ошибок с индексами объектов.
+    """
+
+    check_bulk_items(items)
+    validated, errors = [], []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item, context=context)
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return validated, errors
+
+
+def chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def parse_bulk_update(data):
+    """Приводит тело массового PATCH к списку пар (id, изменения).
+
+    Принимается {"ids": [...], "data": {...}} для одинаковых изменений
+    или список объектов с полем id для изменений по отдельности.
+    """
+
+    if isinstance(data, dict) and 'ids' in data:
+        ids, changes = data.get('ids'), data.get('data')
+        check_bulk_items(ids)
+        return [(pk, changes) for pk in ids]
+    check_bulk_items(data)
+    return [
+        (item.get('id'), item) if isinstance(item, dict) else (None, item)
+        for item in data
+    ]
+
+
+def validate_bulk_update(serializer_class, updates, context):
+    """Проверяет изменения сериализатором с partial=True.
+
+    Возвращает пары (id, проверенные данные) и список ошибок.
+    """
+
+    id_field = serializers.IntegerField()
+    ids, errors = {}, []
+    for index, (pk, _) in enumerate(updates):
+        try:
+            ids[index] = id_field.to_internal_value(pk)
+        except ValidationError as error:
+            errors.append({'index': index, 'errors': {'id': error.detail}})
+    existing = set()
+    for chunk in chunks(ids.values()):
+        existing.update(serializer_class.Meta.model.objects.filter(
+            pk__in=chunk
+        ).values_list('pk', flat=True))
+    validated = []
+    validated_changes = {}
+    for index, (pk, changes) in enumerate(updates):
+        if index not in ids:
+            continue
+        pk = ids[index]
+        if pk not in existing:
+            errors.append({'index': index, 'errors': {
+                'id': [f'Object with id={pk} does not exist.']
+            }})
+            continue
+        if id(changes) not in validated_changes:
+            serializer = serializer_class(
+                data=changes, context=context, partial=True
+            )
+            serializer.is_valid()
+            validated_changes[id(changes)] = serializer
+        serializer = validated_changes[id(changes)]
+        if serializer.errors:
+            errors.append({'index': index, 'errors': serializer.errors})
+        else:
+            validated.append((pk, serializer.validated_data))
+    errors.sort(key=lambda error: error['index'])
+    return validated, errors
+
+
+def bulk_create_with_pks(model, objs):
+    """bulk_create, который всегда проставляет первичные ключи
+    и записывает создание объектов в журнал изменений.
+
+    Если СУБД не возвращает ключи из INSERT (SQLite в Django 3.2),
+    берутся последние добавленные ключи. Вызывать только внутри
+    транзакции: SQLite удерживает блокировку записи, и чужие вставки
+    между bulk_create и чтением ключей невозможны.
+    """
+
+    objs = model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+    if objs and objs[0].pk is None:
+        pks = list(model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        )[:len(objs)])
+        for obj, pk in zip(objs, pks[::-1]):
+            obj.pk = pk
+    log_changes(model, [obj.pk for obj in objs], Change.Actions.CREATE)
+    return objs
+
+
+def bulk_create_titles(validated):
+    """Создаёт произведения и их связи с жанрами в одной транзакции."""
+
+    through = Title.genre.through
+    with transaction.atomic():
+        titles = bulk_create_with_pks(Title, [
+            Title(**{key: value for key, value in data.items()
+                     if key != 'genre'})
+            for data in validated
+        ])
+        links = []
+        for title, data in zip(titles, validated):
+            for genre_id in dict.fromkeys(genre.pk for genre in data['genre']):
+                links.append(through(title_id=title.pk, genre_id=genre_id))
+        through.objects.bulk_create(links, batch_size=BATCH_SIZE)
+        transaction.on_commit(bump_titles_version)
+    return titles
+
+
+def bulk_update_titles(validated):
+    """Применяет изменения произведений set-based запросами.
+
+    Произведения с одинаковыми изменениями обновляются одним
+    UPDATE ... WHERE id IN, жанры заменяются удалением и массовой
+    вставкой строк промежуточной таблицы.
+    """
+
+    through = Title.genre.through
+    groups = defaultdict(list)
+    genres = {}
+    for pk, data in validated:
+        fields = {
+            key: value for key, value in data.items() if key != 'genre'
+        }
+        if 'category' in fields:
+            fields['category_id'] = fields.pop('category').pk
+        if fields:
+            groups[tuple(sorted(fields.items()))].append(pk)
+        if 'genre' in data:
+            genres[pk] = dict.fromkeys(genre.pk for genre in data['genre'])
+    with transaction.atomic():
+        for fields, ids in groups.items():
+            for chunk in chunks(ids):
+                Title.objects.filter(pk__in=chunk).update(**dict(fields))
+        for chunk in chunks(genres):
+            Title.objects.filter(pk__in=chunk).update()
+            through.objects.filter(title_id__in=chunk).delete()
+        through.objects.bulk_create(
+            (
+                through(title_id=pk, genre_id=genre_id)
+                for pk, genre_ids in genres.items()
+                for genre_id in genre_ids
+            ),
+            batch_size=BATCH_SIZE
+        )
+        transaction.on_commit(bump_titles_version)
+    return len({pk for pk, _ in validated})
+
+
+def move_genre_titles(source, target, title_ids=None):
+    """Переносит произведения из жанра source в target.
+
+    Связи, которые дали бы дубликат пары (произведение, target),
+    удаляются, остальные перенаправляются одним UPDATE.
+    """
+
+    through = Title.genre.through
+    links = through.objects.filter(genre_id=source.pk)
+    if title_ids is not None:
+        links = links.filter(title_id__in=title_ids)
+    Title.all_objects.filter(pk__in=links.values('title_id')).update()
+    links.filter(title_id__in=through.objects.filter(
+        genre_id=target.pk
+    ).values('title_id')).delete()
+    return links.update(genre_id=target.pk)
+
+
+def move_category_titles(source, target, title_ids=None):
+    """Переносит произведения из категории source в target одним UPDATE."""
+
+    titles = Title.objects.filter(category_id=source.pk)
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    return titles.update(category_id=target.pk)
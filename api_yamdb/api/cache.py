@@ -0,0 +1,154 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from reviews.constants import TITLES_CACHE_TIMEOUT
+
+
+def get_version(name):
+    """Возвращает счётчик версии данных name.
+
+    Новый счётчик начинается с текущего времени в наносекундах, чтобы
+    после очистки кэша версии не повторяли уже выданные значения.
+    """
+
+    return cache.get_or_set(f'{name}:version', time.time_ns, timeout=None)
+
+
+def get_modified(name):
+    """Возвращает время последнего изменения данных name в секундах."""
+
+    return cache.get_or_set(
+        f'{name}:modified', lambda: int(time.time()), timeout=None
+    )
+
+
+def bump_version(name):
+    try:
+        cache.incr(f'{name}:version')
+    except ValueError:
+        cache.set(f'{name}:version', time.time_ns(), timeout=None)
+    cache.set(f'{name}:modified', int(time.time()), timeout=None)
+
+
+def create_cache_table(sender, using, **kwargs):
+    """Создаёт таблицу DatabaseCache после миграций, если её ещё нет."""
+
+    call_command('createcachetable', database=using, verbosity=0)
+
+
+def get_titles_version():
+    return get_version('titles')
+
+
+def bump_titles_version(**kwargs):
+    """Инвалидирует закэшированные ответы эндпоинта произведений."""
+
+    bump_version('titles')
+
+
+def bump_comments_version(**kwargs):
+    bump_version('comments')
+
+
+def bump_users_version(**kwargs):
+    bump_version('users')
+
+
+class ConditionalGetMixin:
+    """Отдаёт ETag и Last-Modified для list/retrieve и отвечает 304.
+
+    Заголовки считаются по счётчикам версий etag_versions без запросов к
+    БД и сериализации, поэтому повторный опрос без изменений стоит
+    нескольких обращений к кэшу.
+    """
+
+    etag_versions = ('titles',)
+
+    def get_etag(self, request):
+        source = ':'.join((
+            *(str(get_version(name)) for name in self.etag_versions),
+            request.accepted_renderer.format,
+            request.get_host(),
+            request.get_full_path(),
+        ))
+        return quote_etag(hashlib.sha1(source.encode()).hexdigest())
+
+    def get_last_modified(self):
+        return max(get_modified(name) for name in self.etag_versions)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        last_modified = self.get_last_modified()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class VersionedCacheMixin:
+    """Кэширует ответы list/retrieve до смены версии данных."""
+
+    cache_prefix = 'titles'
+    cache_timeout = TITLES_CACHE_TIMEOUT
+    get_cache_version = staticmethod(get_titles_version)
+
+    def get_cache_key(self, request):
+        """Возвращает ключ из версии данных и хэша адреса запроса.
+
+        Параметры запроса хэшируются, чтобы ключ не содержал пробелов и
+        не-ASCII символов и не превышал допустимую бэкендами длину.
+        """
+
+        params = '&'.join(
+            f'{key}={",".join(values)}'
+            for key, values in sorted(request.query_params.lists())
+        )
+        source = ':'.join((request.get_host(), request.path, params))
+        return ':'.join((
+            self.cache_prefix,
+            str(self.get_cache_version()),
+            hashlib.sha1(source.encode()).hexdigest(),
+        ))
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
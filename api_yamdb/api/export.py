@@ -0,0 +1,90 @@
+import csv
+import json
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+from reviews.constants import EXPORT_CHUNK_SIZE
+from .readers import TitleReader
+
+CSV_COLUMNS = (
+    'id',
+    'name',
+    'year',
+    'rating',
+    'description',
+    'category',
+    'genre',
+    'updated_at',
+)
+
+
+class Echo:
+    """Файлоподобный объект, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_titles(queryset, reader, chunk_size=EXPORT_CHUNK_SIZE):
+    """Выдаёт произведения в представлении reader порциями по chunk_size.
+
+    Строки читаются курсором через iterator(), жанры догружаются одним
+    запросом на порцию, поэтому память не зависит от размера каталога.
+    """
+
+    rows = reader.get_values(queryset).order_by('pk').iterator(
+        chunk_size=chunk_size
+    )
+    for chunk in iter_chunks(rows, chunk_size):
+        yield from reader.to_representation(chunk)
+
+
+def ndjson_lines(titles):
+    for title in titles:
+        yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+def csv_lines(titles):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for title in titles:
+        yield writer.writerow(
+            ','.join(title[column]) if column == 'genre' else title[column]
+            for column in CSV_COLUMNS
+        )
+
+
+# Формат: (тип содержимого, генератор строк, expand для TitleReader).
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines, None),
+    'csv': ('text/csv', csv_lines, ()),
+}
+
+
+def export_titles(queryset, export_format):
+    """Возвращает потоковый ответ с выгрузкой произведений queryset."""
+
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError({
+            'type': f'Unknown export format: {export_format}.'
+        })
+    content_type, lines, expand = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        lines(iter_titles(queryset, TitleReader(expand=expand))),
+        content_type=f'{content_type}; charset=utf-8'
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="titles.{export_format}"'
+    )
+    return response
@@ -0,0 +1,83 @@
+from django.db.models import Count, F, IntegerField
+from django.db.models.expressions import ExpressionWrapper
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import Title
+
+DECADE = 10
+
+
+def genre_facet(titles):
+    return [
+        {'slug': row['genre__slug'], 'name': row['genre__name'],
+         'count': row['count']}
+        for row in Title.genre.through.objects.filter(
+            title_id__in=titles
+        ).values('genre__slug', 'genre__name').annotate(
+            count=Count('title_id')
+        ).order_by('genre__name', 'genre__slug')
+    ]
+
+
+def category_facet(titles):
+    return [
+        {'slug': row['category__slug'], 'name': row['category__name'],
+         'count': row['count']}
+        for row in Title.objects.filter(pk__in=titles).values(
+            'category__slug', 'category__name'
+        ).annotate(count=Count('id')).order_by(
+            'category__name', 'category__slug'
+        )
+    ]
+
+
+def year_facet(titles):
+    return list(
+        Title.objects.filter(pk__in=titles).annotate(
+            decade=ExpressionWrapper(
+                F('year') / DECADE * DECADE, output_field=IntegerField()
+            )
+        ).values('decade').annotate(count=Count('id')).order_by('decade')
+    )
+
+
+class FacetedListMixin:
+    """Добавляет в ответ list количество объектов по значениям фасетов.
+
+    Фасеты запрашиваются параметром ?facets=genre,category,year и
+    считаются группирующими запросами по всей отфильтрованной выборке.
+    """
+
+    facets_query_param = 'facets'
+    facets = {
+        'genre': genre_facet,
+        'category': category_facet,
+        'year': year_facet,
+    }
+
+    def get_facet_names(self, request):
+        names = [
+            name.strip() for name in request.query_params.get(
+                self.facets_query_param, ''
+            ).split(',') if name.strip()
+        ]
+        unknown = set(names) - self.facets.keys()
+        if unknown:
+            raise ValidationError({
+                self.facets_query_param: (
+                    f'Unknown facets: {", ".join(sorted(unknown))}.'
+                )
+            })
+        return names
+
+    def list(self, request, *args, **kwargs):
+        names = self.get_facet_names(request)
+        response = super().list(request, *args, **kwargs)
+        if names:
+            titles = self.filter_queryset(
+                self.get_queryset()
+            ).order_by().values('pk')
+            response.data['facets'] = {
+                name: self.facets[name](titles) for name in names
+            }
+        return response
@@ -0,0 +1,67 @@
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class SlugManyRelatedField(serializers.ManyRelatedField):
+    """ManyRelatedField, который находит все слаги одним запросом slug__in."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        slugs = [child.to_slug(value) for value in data]
+        found = child.get_known_objects()
+        if found is None:
+            found = {
+                getattr(obj, child.slug_field): obj
+                for obj in child.get_queryset().filter(
+                    **{f'{child.slug_field}__in': set(slugs)}
+                )
+            }
+        missing = [slug for slug in dict.fromkeys(slugs) if slug not in found]
+        if missing:
+            raise serializers.ValidationError([
+                child.error_messages['does_not_exist'].format(
+                    slug_name=child.slug_field, value=slug
+                )
+                for slug in missing
+            ])
+        return [found[slug] for slug in slugs]
+
+
+class BatchSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который при many=True не делает запрос на слаг.
+
+    Если в контексте сериализатора передан словарь known_objects
+    {модель: {слаг: объект}}, слаги ищутся в нём без запросов к БД.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return SlugManyRelatedField(**list_kwargs)
+
+    def to_slug(self, data):
+        if not isinstance(data, (str, int)):
+            self.fail('invalid')
+        return str(data)
+
+    def get_known_objects(self):
+        known_objects = self.context.get('known_objects')
+        if known_objects is None:
+            return None
+        return known_objects.get(self.get_queryset().model, {})
+
+    def to_internal_value(self, data):
+        known_objects = self.get_known_objects()
+        if known_objects is None:
+            return super().to_internal_value(data)
+        slug = self.to_slug(data)
+        if slug not in known_objects:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=slug)
+        return known_objects[slug]
@@ -1,16 +1,88 @@
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
 
 from reviews.models import Title
+from reviews.search import normalize_search_text, prefix_range, search_titles
+
+
+def prefix_q(field_name, value):
+    start, end = prefix_range(value)
+    return Q(**{f'{field_name}__gte': start, f'{field_name}__lt': end})
+
+
+class NormalizedPrefixFilter(filters.CharFilter):
+    """Поиск по префиксу в нормализованном индексируемом поле."""
+
+    def filter(self, qs, value):
+        value = normalize_search_text(value)
+        if not value:
+            return qs
+        return self.get_method(qs)(prefix_q(self.field_name, value))
+
+
+class PrefixSearchFilter(SearchFilter):
+    """SearchFilter по префиксу нормализованных полей из search_fields.
+
+    Строка поиска целиком считается префиксом значения поля.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        prefix = normalize_search_text(
+            ' '.join(self.get_search_terms(request))
+        )
+        if not search_fields or not prefix:
+            return queryset
+        return queryset.filter(reduce(or_, (
+            prefix_q(field_name, prefix) for field_name in search_fields
+        )))
 
 
 class TitleSearchFilter(filters.FilterSet):
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    name = NormalizedPrefixFilter(field_name='name_search')
     genre = filters.CharFilter(field_name='genre__slug', lookup_expr='iexact')
     category = filters.CharFilter(
         field_name='category__slug',
         lookup_expr='iexact'
     )
+    q = filters.CharFilter(method='filter_fulltext')
 
     class Meta:
         model = Title
         fields = ('name', 'genre', 'year', 'category',)
+
+    def filter_fulltext(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class UpdatedSinceFilter(BaseFilterBackend):
+    """Оставляет объекты, изменённые начиная с момента ?updated_since=.
+
+    Время передаётся в ISO 8601; без часового пояса считается временем
+    TIME_ZONE. Неэкранированный «+» смещения приходит пробелом и
+    восстанавливается.
+    """
+
+    query_param = 'updated_since'
+    invalid_message = 'Enter a valid ISO 8601 date/time.'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.query_param, '').strip()
+        if not value:
+            return queryset
+        try:
+            since = parse_datetime(value.replace(' ', '+'))
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError({self.query_param: self.invalid_message})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return queryset.filter(updated_at__gte=since)
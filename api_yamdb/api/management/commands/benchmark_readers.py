@@ -0,0 +1,83 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.readers import CommentReader, ReviewReader, TitleReader
+from api.serializers import (CommentSerializer,
+                             ReviewSerializer,
+                             TitleSerializerForRead)
+from reviews.models import Comment, Review, Title
+
+BENCHMARKS = {
+    'titles': (
+        Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).order_by('name', 'pk'),
+        TitleSerializerForRead,
+        TitleReader,
+    ),
+    'reviews': (
+        Review.objects.order_by('-pub_date', 'pk'),
+        ReviewSerializer,
+        ReviewReader,
+    ),
+    'comments': (
+        Comment.objects.order_by('-pub_date', 'pk'),
+        CommentSerializer,
+        CommentReader,
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость сериализаторов и быстрого пути чтения '
+        'списков на данных текущей БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=100,
+            help='Количество объектов в одном ответе.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Количество повторов каждого замера.'
+        )
+
+    def measure(self, build, repeat):
+        start = perf_counter()
+        for _ in range(repeat):
+            data = build()
+        return perf_counter() - start, JSONRenderer().render(data)
+
+    def handle(self, **options):
+        limit, repeat = options['limit'], options['repeat']
+        if limit <= 0 or repeat <= 0:
+            raise CommandError('--limit and --repeat must be positive.')
+        for name, (queryset, serializer_class, reader_class) in (
+            BENCHMARKS.items()
+        ):
+            serializer_time, serializer_json = self.measure(
+                lambda: serializer_class(
+                    queryset.all()[:limit], many=True
+                ).data,
+                repeat
+            )
+
+            def read():
+                reader = reader_class()
+                return reader.to_representation(
+                    reader.get_values(queryset.all())[:limit]
+                )
+
+            reader_time, reader_json = self.measure(read, repeat)
+            if serializer_json != reader_json:
+                raise CommandError(f'{name}: reader output differs.')
+            rows = len(reader_class().get_values(queryset)[:limit]) * repeat
+            self.stdout.write(
+                f'{name}: {rows / serializer_time:.0f} rows/s serializer, '
+                f'{rows / reader_time:.0f} rows/s reader, '
+                f'x{serializer_time / reader_time:.1f}'
+            )
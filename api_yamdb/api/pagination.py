@@ -0,0 +1,288 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from reviews.constants import (CHANGES_PAGE_SIZE,
+                               MAX_CHANGES_LIMIT,
+                               MAX_PAGE_LIMIT)
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу (значение поля сортировки, id).
+
+    Стоимость страницы не зависит от её глубины: вместо OFFSET и COUNT(*)
+    выборка продолжается с позиции, закодированной в курсоре.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    ordering_param = api_settings.ORDERING_PARAM
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = MAX_PAGE_LIMIT
+    default_ordering = 'name'
+    keyset_fields = {'name': 'name'}
+    invalid_cursor_message = 'Invalid cursor.'
+    # Параметры, с которыми порядок выборки не задаётся ключом курсора.
+    unsupported_params = ()
+    unsupported_message = 'Not supported with cursor pagination.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        for param in self.unsupported_params:
+            if request.query_params.get(param):
+                raise ValidationError({param: self.unsupported_message})
+        self.ordering, descending = self.get_ordering(request, view)
+        position, reverse = self.decode_cursor(request)
+
+        key = self.keyset_fields[self.ordering]
+        queryset = queryset.annotate(
+            keyset_value=F(key) if isinstance(key, str) else key
+        )
+        key = 'keyset_value'
+
+        descending_now = descending != reverse
+        queryset = queryset.order_by(
+            *(f'-{name}' if descending_now else name for name in (key, 'pk'))
+        )
+        if position is not None:
+            value, pk = self.clean_position(queryset, position)
+            lookup = 'lt' if descending_now else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{key}__{lookup}': value})
+                | Q(**{key: value, f'pk__{lookup}': pk})
+            )
+
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = page
+        return page
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get_ordering(self, request, view=None):
+        """Возвращает поле ключа и направление сортировки.
+
+        Сортировка по полю из ordering_fields представления, для которого
+        нет ключа курсора, отклоняется, а не заменяется порядком по
+        умолчанию.
+        """
+
+        params = request.query_params.get(self.ordering_param, '')
+        ordering = params.split(',')[0].strip()
+        if ordering.lstrip('-') in self.keyset_fields:
+            return ordering.lstrip('-'), ordering.startswith('-')
+        view_fields = getattr(view, 'ordering_fields', None) or ()
+        if ordering.lstrip('-') in view_fields:
+            raise ValidationError({
+                self.ordering_param: self.unsupported_message
+            })
+        ordering = self.default_ordering
+        return ordering.lstrip('-'), ordering.startswith('-')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value, pk = cursor['p']
+            return (value, int(pk)), bool(cursor.get('r'))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def clean_position(self, queryset, position):
+        """Приводит значение из курсора к типу ключа сортировки."""
+
+        value, pk = position
+        field = queryset.query.annotations['keyset_value'].output_field
+        try:
+            value = field.to_python(value)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            return obj['keyset_value'], obj['id']
+        return obj.keyset_value, obj.pk
+
+    def encode_cursor(self, obj, reverse):
+        value, pk = self.get_position(obj)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        cursor = json.dumps({'p': [value, pk], 'r': int(reverse)})
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(cursor.encode()).decode()
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class OptionalKeysetPagination(LimitOffsetPagination):
+    """LimitOffsetPagination с режимом курсоров, включаемым параметром."""
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.keyset_class.cursor_query_param in request.query_params
+        ):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitleKeysetPagination(KeysetPagination):
+    """Курсоры по названию, году и категории.
+
+    Сортировка по жанру требует группировки всей выборки на каждой
+    странице, а поиск ?q= упорядочен по bm25, которого нет в ключе, поэтому
+    они доступны только с пагинацией limit/offset.
+    """
+
+    default_ordering = 'name'
+    keyset_fields = {
+        'name': 'name',
+        'year': 'year',
+        # Как OrderingFilter: по Category.Meta.ordering, то есть названию.
+        'category': 'category__name',
+    }
+    unsupported_params = ('q',)
+
+
+class TitlePagination(OptionalKeysetPagination):
+    keyset_class = TitleKeysetPagination
+
+
+class PubDateKeysetPagination(KeysetPagination):
+    default_ordering = '-pub_date'
+    keyset_fields = {'pub_date': 'pub_date'}
+
+
+class PubDatePagination(OptionalKeysetPagination):
+    keyset_class = PubDateKeysetPagination
+
+
+class ChangeFeedPagination(BasePagination):
+    """Порции журнала изменений после записи с id из ?after=.
+
+    Курсор — id последней полученной записи, поэтому потребитель может
+    сохранить его и продолжить чтение с того же места.
+    """
+
+    after_query_param = 'after'
+    limit_query_param = 'limit'
+    default_limit = CHANGES_PAGE_SIZE
+    max_limit = MAX_CHANGES_LIMIT
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        after = self.get_after(request)
+        limit = self.get_limit(request)
+        page = list(queryset.filter(pk__gt=after).order_by('pk')[:limit + 1])
+        self.has_more = len(page) > limit
+        self.page = page[:limit]
+        self.cursor = self.page[-1].pk if self.page else after
+        return self.page
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def get_after(self, request):
+        try:
+            after = int(request.query_params.get(self.after_query_param, 0))
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if after < 0:
+            raise NotFound(self.invalid_cursor_message)
+        return after
+
+    def get_paginated_response(self, data):
+        return Response({
+            'cursor': self.cursor,
+            'has_more': self.has_more,
+            'next': replace_query_param(
+                self.base_url, self.after_query_param, self.cursor
+            ),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'cursor': {'type': 'integer'},
+                'has_more': {'type': 'boolean'},
+                'next': {'type': 'string'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,239 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from reviews.constants import SLICE
+from reviews.models import Title
+
+datetime_representation = serializers.DateTimeField().to_representation
+
+
+class Column:
+    """Поле ответа, собираемое из значений lookups строки .values()."""
+
+    def __init__(self, *lookups, convert=None):
+        self.lookups = lookups
+        self.convert = convert
+
+    def compile(self, reader):
+        getter = itemgetter(*self.lookups)
+        convert = self.convert
+        if isinstance(convert, str):
+            convert = getattr(reader, convert)
+        if convert is None:
+            return getter
+        if len(self.lookups) == 1:
+            return lambda row: convert(getter(row))
+        return lambda row: convert(*getter(row))
+
+
+class ValuesReader:
+    """Быстрый путь чтения без ModelSerializer.
+
+    Строки берутся одним запросом .values(), а план из пар
+    (имя поля, функция доступа) строится один раз на ответ. Порядок и
+    значения полей совпадают с ответом соответствующего сериализатора.
+    fields оставляет в ответе и в SQL только перечисленные поля, а expand
+    задаёт связи, которые выводятся вложенными объектами из
+    expanded_columns вместо идентификаторов из columns.
+    """
+
+    columns = {}
+    expanded_columns = {}
+    default_expand = ()
+
+    def __init__(self, fields=None, expand=None):
+        if expand is None:
+            expand = self.default_expand
+        columns = {
+            name: self.expanded_columns[name] if name in expand else column
+            for name, column in self.columns.items()
+            if fields is None or name in fields
+        }
+        self.lookups = tuple(dict.fromkeys(
+            lookup for column in columns.values()
+            for lookup in column.lookups
+        ))
+        self.plan = tuple(
+            (name, column.compile(self)) for name, column in columns.items()
+        )
+
+    @classmethod
+    def check_params(cls, fields, expand):
+        """Возвращает ошибки для неизвестных полей и связей."""
+
+        errors = {}
+        for param, names, known in (
+            ('fields', fields, cls.columns),
+            ('expand', expand, cls.expanded_columns),
+        ):
+            unknown = sorted(set(names or ()) - known.keys())
+            if unknown:
+                errors[param] = f'Unknown fields: {", ".join(unknown)}.'
+        return errors
+
+    def has_field(self, name):
+        return any(field == name for field, _ in self.plan)
+
+    def get_values(self, queryset):
+        return queryset.prefetch_related(None).values(
+            *self.lookups, *queryset.query.extra_select
+        )
+
+    def prepare(self, rows):
+        """Догружает данные, общие для всей страницы."""
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        plan = self.plan
+        return [{name: get(row) for name, get in plan} for row in rows]
+
+
+def title_rating(rating_sum, rating_count):
+    if not rating_count:
+        return None
+    return int(rating_sum / rating_count)
+
+
+def name_slug(name, slug):
+    return {'name': name, 'slug': slug}
+
+
+def username(value):
+    return value[:SLICE]
+
+
+def id_name(pk, name):
+    return {'id': pk, 'name': name}
+
+
+def id_score(pk, score):
+    return {'id': pk, 'score': score}
+
+
+class TitleReader(ValuesReader):
+    columns = {
+        'id': Column('id'),
+        'name': Column('name'),
+        'year': Column('year'),
+        'rating': Column('rating_sum', 'rating_count', convert=title_rating),
+        'description': Column('description'),
+        'genre': Column('id', convert='get_genre_slugs'),
+        'category': Column('category__slug'),
+        'updated_at': Column('updated_at', convert=datetime_representation),
+    }
+    expanded_columns = {
+        'genre': Column('id', convert='get_genre'),
+        'category': Column(
+            'category__name', 'category__slug', convert=name_slug
+        ),
+    }
+    default_expand = ('genre', 'category')
+
+    def prepare(self, rows):
+        self.genres = defaultdict(list)
+        if not self.has_field('genre'):
+            return
+        for title_id, name, slug in Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('genre__name').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        ):
+            self.genres[title_id].append(name_slug(name, slug))
+
+    def get_genre(self, title_id):
+        return self.genres.get(title_id, [])
+
+    def get_genre_slugs(self, title_id):
+        return [genre['slug'] for genre in self.get_genre(title_id)]
+
+
+class ReviewReader(ValuesReader):
+    columns = {
+        'title': Column('title_id'),
+        'author': Column('author__username', convert=username),
+        'id': Column('id'),
+        'text': Column('text'),
+        'score': Column('score'),
+        'pub_date': Column('pub_date', convert=datetime_representation),
+        'updated_at': Column('updated_at', convert=datetime_representation),
+    }
+    expanded_columns = {
+        'title': Column('title_id', 'title__name', convert=id_name),
+    }
+
+
+class CommentReader(ValuesReader):
+    columns = {
+        'review': Column('review_id'),
+        'author': Column('author__username', convert=username),
+        'id': Column('id'),
+        'text': Column('text'),
+        'pub_date': Column('pub_date', convert=datetime_representation),
+        'updated_at': Column('updated_at', convert=datetime_representation),
+    }
+    expanded_columns = {
+        'review': Column('review_id', 'review__score', convert=id_score),
+    }
+
+
+class ValuesReadMixin:
+    """Отдаёт list и retrieve через reader_class.
+
+    При reader_class = None ответы строит сериализатор. Объектные права на
+    чтение не проверяются: permission_classes проекта разрешают
+    безопасные методы для любого объекта.
+    """
+
+    reader_class = None
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def get_param_names(self, param):
+        if param not in self.request.query_params:
+            return None
+        names = self.request.query_params[param].split(',')
+        return {name.strip() for name in names if name.strip()}
+
+    def get_reader(self):
+        fields = self.get_param_names(self.fields_query_param)
+        expand = self.get_param_names(self.expand_query_param)
+        errors = self.reader_class.check_params(fields, expand)
+        if errors:
+            raise ValidationError(errors)
+        return self.reader_class(fields=fields or None, expand=expand)
+
+    def list(self, request, *args, **kwargs):
+        if self.reader_class is None:
+            return super().list(request, *args, **kwargs)
+        reader = self.get_reader()
+        rows = reader.get_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                reader.to_representation(page)
+            )
+        return Response(reader.to_representation(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.reader_class is None:
+            return super().retrieve(request, *args, **kwargs)
+        reader = self.get_reader()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            data = reader.to_representation(reader.get_values(
+                self.filter_queryset(self.get_queryset()).filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+            )[:1])
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        if not data:
+            raise Http404
+        return Response(data[0])
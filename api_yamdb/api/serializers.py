@@ -11,13 +11,16 @@ from reviews.constants import (LENGTH_FOR_FIELD,
                                MIN_SCORE_VALUE,
                                MAX_SCORE_VALUE,
                                SCORE_VALIDATOR_ERROR_MESSAGE,
-                               DEFAULT_RATING)
+                               DEFAULT_RATING,
+                               MAX_BULK_SIZE)
 from reviews.models import (Category,
                             ApiUser,
+                            Change,
                             Genre,
                             Title,
                             Comment,
                             Review)
+from .fields import BatchSlugRelatedField
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -32,15 +35,43 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('name', 'slug',)
 
 
+class ChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Change
+        fields = ('id', 'model', 'object_id', 'action', 'created_at')
+
+
+class ViewQuerysetSlugField(serializers.SlugRelatedField):
+    def get_queryset(self):
+        return self.context['view'].get_queryset()
+
+
+class MoveTitlesSerializer(serializers.Serializer):
+    target = ViewQuerysetSlugField(slug_field='slug')
+    titles = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MAX_BULK_SIZE,
+        required=False
+    )
+
+    def validate_target(self, target):
+        if target == self.context['source']:
+            raise serializers.ValidationError(
+                'Target must differ from the source.'
+            )
+        return target
+
+
 class TitleSerializerForWrite(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True,
         allow_null=False,
         allow_empty=False
     )
-    category = serializers.SlugRelatedField(
+    category = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -75,9 +106,40 @@ class TitleSerializerForRead(serializers.ModelSerializer):
             'description',
             'genre',
             'category',
+            'updated_at',
         )
 
 
+class TitleStatsSerializer(serializers.ModelSerializer):
+    count = serializers.IntegerField(source='rating_count')
+    mean = serializers.FloatField(source='rating')
+    median = serializers.SerializerMethodField()
+    histogram = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'count', 'mean', 'median', 'histogram')
+
+    def get_histogram(self, obj):
+        if not hasattr(obj, '_score_histogram'):
+            obj._score_histogram = obj.get_score_histogram()
+        return obj._score_histogram
+
+    def get_median(self, obj):
+        if not obj.rating_count:
+            return None
+        middle = ((obj.rating_count - 1) // 2, obj.rating_count // 2)
+        values = []
+        passed = 0
+        for score, count in self.get_histogram(obj).items():
+            values.extend(
+                score for position in middle
+                if passed <= position < passed + count
+            )
+            passed += count
+        return sum(values) / len(values)
+
+
 class ValidateUsernameMixin:
     def validate_username(self, username):
         return check_username(username)
@@ -118,9 +180,9 @@ class SignupSerializer(serializers.Serializer, ValidateUsernameMixin):
                 username=data['username'],
                 email=data['email']).exists():
             return data
-        if ApiUser.objects.filter(username=data['username']).exists():
+        if ApiUser.all_objects.filter(username=data['username']).exists():
             raise serializers.ValidationError('Username already taken.')
-        if ApiUser.objects.filter(email=data['email']).exists():
+        if ApiUser.all_objects.filter(email=data['email']).exists():
             raise serializers.ValidationError('Email already exists.')
         return data
 
@@ -194,7 +256,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         return super().validate(attrs)
 
     class Meta:
-        fields = ('title', 'author', 'id', 'text', 'score', 'pub_date')
+        fields = (
+            'title', 'author', 'id', 'text', 'score', 'pub_date', 'updated_at'
+        )
         read_only_fields = ('title',)
         model = Review
 
@@ -205,6 +269,6 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = ('review', 'author', 'id', 'text', 'pub_date')
+        fields = ('review', 'author', 'id', 'text', 'pub_date', 'updated_at')
         read_only_fields = ('title', 'review', 'pub_date')
         model = Comment
@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import ApiUser, Category, Comment, Genre, Review, Title
+from reviews.fields import bulk_changed
+from .cache import (bump_comments_version,
+                    bump_titles_version,
+                    bump_users_version)
+
+
+def after_commit(bump):
+    """Возвращает приёмник сигнала, меняющий версию после фиксации.
+
+    Сигналы приходят внутри транзакции записи: если сменить версию сразу,
+    параллельный запрос успеет закэшировать старые строки под новой
+    версией.
+    """
+
+    def handler(**kwargs):
+        transaction.on_commit(bump)
+    return handler
+
+
+RECEIVERS = {
+    bump: after_commit(bump)
+    for bump in (
+        bump_titles_version, bump_comments_version, bump_users_version
+    )
+}
+
+# Версии данных, которые меняют изменения объектов модели.
+BUMPS = {
+    Title: bump_titles_version,
+    Title.genre.through: bump_titles_version,
+    Genre: bump_titles_version,
+    Category: bump_titles_version,
+    Review: bump_titles_version,
+    Comment: bump_comments_version,
+    ApiUser: bump_users_version,
+}
+
+for model, bump in BUMPS.items():
+    if model._meta.auto_created:
+        m2m_changed.connect(RECEIVERS[bump], sender=model)
+        continue
+    post_save.connect(RECEIVERS[bump], sender=model)
+    post_delete.connect(RECEIVERS[bump], sender=model)
+
+
+@receiver(bulk_changed)
+def bump_bulk_changed(sender, models, **kwargs):
+    for bump in {BUMPS[model] for model in models if model in BUMPS}:
+        transaction.on_commit(bump)
@@ -1,7 +1,8 @@
 from rest_framework import routers
 from django.urls import include, path
 
-from .views import (TitleViewSet,
+from .views import (ChangeViewSet,
+                    TitleViewSet,
                     GenreViewSet,
                     CategoryViewSet,
                     ApiUserViewSet,
@@ -24,6 +25,7 @@ router_v1.register(
     basename='comment'
 )
 router_v1.register(r'users', ApiUserViewSet, basename='users')
+router_v1.register(r'changes', ChangeViewSet, basename='change')
 
 auth_patterns = [
     path('signup/', SignupAPIView.as_view(), name='signup'),
@@ -1,4 +1,4 @@
-from django.db.models import Avg
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (filters,
@@ -8,29 +8,65 @@ from rest_framework import (filters,
                             permissions)
 from rest_framework.pagination import (LimitOffsetPagination,
                                        PageNumberPagination)
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView
 
+from reviews.deletion import mark_deleted
 from reviews.models import (Category,
                             ApiUser,
+                            Change,
+                            Comment,
                             Genre,
                             Review,
                             Title)
 from .permissions import (AdminOnly,
                           IsAdminOrReadOnly,
                           PermissionForReviewsAndComments)
-from .serializers import (CommentSerializer,
+from .serializers import (ChangeSerializer,
+                          CommentSerializer,
                           ReviewSerializer,
                           TitleSerializerForRead,
+                          TitleStatsSerializer,
                           TitleSerializerForWrite,
                           GenreSerializer,
                           CategorySerializer,
+                          MoveTitlesSerializer,
                           ApiUserSerializer,
                           SignupSerializer,
                           ApiUserTokenSerializer,
                           UserDetailSerializer)
-from .filters import TitleSearchFilter
+from .bulk import (bulk_create_titles,
+                   bulk_update_titles,
+                   load_known_objects,
+                   move_category_titles,
+                   move_genre_titles,
+                   parse_bulk_update,
+                   validate_bulk_items,
+                   validate_bulk_update)
+from .cache import (ConditionalGetMixin,
+                    VersionedCacheMixin,
+                    bump_titles_version)
+from .export import export_titles
+from .facets import FacetedListMixin
+from .filters import (PrefixSearchFilter,
+                      TitleSearchFilter,
+                      UpdatedSinceFilter)
+from .pagination import (ChangeFeedPagination,
+                         PubDatePagination,
+                         TitlePagination)
+from .parsers import NDJSONParser
+from .readers import (CommentReader,
+                      ReviewReader,
+                      TitleReader,
+                      ValuesReadMixin)
+
+
+class MarkDeletedMixin:
+    def perform_destroy(self, instance):
+        mark_deleted(instance)
 
 
 class DestroyCreateListViewSet(mixins.ListModelMixin,
@@ -39,18 +75,62 @@ class DestroyCreateListViewSet(mixins.ListModelMixin,
                                viewsets.GenericViewSet):
     lookup_field = 'slug'
     pagination_class = PageNumberPagination
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    filter_backends = (
+        DjangoFilterBackend, PrefixSearchFilter, UpdatedSinceFilter
+    )
     filterset_fields = ('name',)
-    search_fields = ('name',)
+    search_fields = ('name_search',)
     permission_classes = (IsAdminOrReadOnly,)
+    move_titles = None
+
+    def get_move_serializer(self, request, source):
+        serializer = MoveTitlesSerializer(
+            data=request.data,
+            context={**self.get_serializer_context(), 'source': source}
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @action(methods=['POST'], detail=True, permission_classes=(AdminOnly,))
+    def merge(self, request, slug=None):
+        source = self.get_object()
+        target = self.get_move_serializer(request, source)['target']
+        with transaction.atomic():
+            moved = self.move_titles(source, target)
+            source.delete()
+            transaction.on_commit(bump_titles_version)
+        return Response(data={'moved': moved, 'target': target.slug})
 
+    @action(methods=['POST'], detail=True, permission_classes=(AdminOnly,))
+    def split(self, request, slug=None):
+        source = self.get_object()
+        data = self.get_move_serializer(request, source)
+        if 'titles' not in data:
+            raise ValidationError({'titles': ['This field is required.']})
+        with transaction.atomic():
+            moved = self.move_titles(
+                source, data['target'], data['titles']
+            )
+            transaction.on_commit(bump_titles_version)
+        return Response(data={'moved': moved, 'target': data['target'].slug})
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')).order_by('name',)
+
+class TitleViewSet(ConditionalGetMixin,
+                   VersionedCacheMixin,
+                   FacetedListMixin,
+                   MarkDeletedMixin,
+                   ValuesReadMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('name',)
     serializer_class = TitleSerializerForWrite
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    pagination_class = TitlePagination
+    reader_class = TitleReader
+    filter_backends = (
+        DjangoFilterBackend, filters.OrderingFilter, UpdatedSinceFilter
+    )
     filterset_class = TitleSearchFilter
     ordering_fields = ('genre', 'category', 'year',)
     filterset_fields = ('genre', 'category', 'year',)
@@ -61,23 +141,80 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleSerializerForWrite
         return TitleSerializerForRead
 
+    @action(methods=['GET'], detail=True, url_path='stats')
+    def get_stats(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.prefetch_related('score_counts'), pk=pk
+        )
+        return Response(data=TitleStatsSerializer(title).data)
+
+    @action(methods=['GET'],
+            detail=False,
+            permission_classes=(AdminOnly,),
+            url_path='export')
+    def export(self, request):
+        return export_titles(
+            self.filter_queryset(self.get_queryset()),
+            request.query_params.get('type', 'ndjson')
+        )
+
+    @action(methods=['POST'],
+            detail=False,
+            permission_classes=(AdminOnly,),
+            parser_classes=(JSONParser, NDJSONParser),
+            url_path='bulk')
+    def bulk_create(self, request):
+        context = self.get_serializer_context()
+        context['known_objects'] = load_known_objects(request.data)
+        validated, errors = validate_bulk_items(
+            TitleSerializerForWrite, request.data, context
+        )
+        if errors:
+            return Response(
+                data={'errors': errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        titles = bulk_create_titles(validated)
+        return Response(
+            data={'created': len(titles),
+                  'ids': [title.pk for title in titles]},
+            status=status.HTTP_201_CREATED
+        )
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        updates = parse_bulk_update(request.data)
+        context = self.get_serializer_context()
+        context['known_objects'] = load_known_objects(
+            [changes for _, changes in updates]
+        )
+        validated, errors = validate_bulk_update(
+            TitleSerializerForWrite, updates, context
+        )
+        if errors:
+            return Response(
+                data={'errors': errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(data={'updated': bulk_update_titles(validated)})
+
 
 class GenreViewSet(DestroyCreateListViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    move_titles = staticmethod(move_genre_titles)
 
 
-class CategoryViewSet(DestroyCreateListViewSet):
+class CategoryViewSet(MarkDeletedMixin, DestroyCreateListViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    move_titles = staticmethod(move_category_titles)
 
 
-class ApiUserViewSet(viewsets.ModelViewSet):
+class ApiUserViewSet(MarkDeletedMixin, viewsets.ModelViewSet):
     queryset = ApiUser.objects.all()
     serializer_class = ApiUserSerializer
     lookup_field = 'username'
-    filter_backends = (filters.OrderingFilter, filters.SearchFilter)
-    search_fields = ('username',)
+    filter_backends = (filters.OrderingFilter, PrefixSearchFilter)
+    search_fields = ('username_search',)
     ordering_fields = ('username',)
     pagination_class = LimitOffsetPagination
     permission_classes = (AdminOnly,)
@@ -102,6 +239,14 @@ class ApiUserViewSet(viewsets.ModelViewSet):
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
 
+class ChangeViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    permission_classes = (AdminOnly,)
+    pagination_class = ChangeFeedPagination
+    filter_backends = ()
+
+
 class SignupAPIView(CreateAPIView):
     serializer_class = SignupSerializer
 
@@ -122,35 +267,49 @@ class GetTokenAPIView(CreateAPIView):
         return Response(data=request.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin,
+                    ValuesReadMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (PermissionForReviewsAndComments,)
+    filter_backends = (UpdatedSinceFilter,)
+    pagination_class = PubDatePagination
+    reader_class = ReviewReader
+    etag_versions = ('titles', 'users')
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        return get_object_or_404(
+            Title.objects, pk=self.kwargs.get('title_id')
+        )
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return Review.objects.filter(title=self.get_title())
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin,
+                     ValuesReadMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (PermissionForReviewsAndComments,)
+    filter_backends = (UpdatedSinceFilter,)
+    pagination_class = PubDatePagination
+    reader_class = CommentReader
+    etag_versions = ('titles', 'comments', 'users')
     http_method_names = ('get', 'post', 'patch', 'delete',)
 
     def get_review(self):
         return get_object_or_404(
-            Review,
+            Review.objects,
             pk=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id')
+            title__in=Title.objects.filter(pk=self.kwargs.get('title_id'))
         )
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return Comment.objects.filter(review=self.get_review())
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
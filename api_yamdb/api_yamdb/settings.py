@@ -62,6 +62,15 @@ DATABASES = {
     }
 }
 
+# Кэш общий для всех процессов сервера: версии данных, которые меняет один
+# процесс, должны видеть остальные. Таблица создаётся при migrate.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'api_yamdb_cache',
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -93,6 +102,8 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 AUTH_USER_MODEL = 'reviews.ApiUser'
 
+PURGE_DELETED_IN_BACKGROUND = True
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -2,7 +2,13 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from .constants import LIST_PER_PAGE
-from .models import ApiUser, Category, Comment, Genre, Review, Title
+from .models import (ApiUser,
+                     Category,
+                     Change,
+                     Comment,
+                     Genre,
+                     Review,
+                     Title)
 
 
 class ReviewAndCommentBaseAdmin(admin.ModelAdmin):
@@ -132,3 +138,28 @@ class GenreAdmin(GenreCategoryAdmin):
 @admin.register(Category)
 class CategoryAdmin(GenreCategoryAdmin):
     pass
+
+
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'model',
+        'object_id',
+        'action',
+        'created_at',
+    )
+    list_filter = (
+        'model',
+        'action',
+    )
+    list_per_page = LIST_PER_PAGE
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
@@ -7,3 +8,8 @@ class ReviewsConfig(AppConfig):
     verbose_name = '''
         Управление произведениями, отзывами, комментариями, пользователями
     '''
+
+    def ready(self):
+        from . import changes, signals  # noqa: F401
+        from .search import install_search_index
+        post_migrate.connect(install_search_index, sender=self)
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_save
+
+from .fields import rows_updated
+from .models import ApiUser, Category, Change, Comment, Genre, Review, Title
+
+BATCH_SIZE = 500
+
+LOGGED_MODELS = {
+    Title: Change.Models.TITLE,
+    Genre: Change.Models.GENRE,
+    Category: Change.Models.CATEGORY,
+    Review: Change.Models.REVIEW,
+    Comment: Change.Models.COMMENT,
+    ApiUser: Change.Models.USER,
+}
+
+
+def log_changes(model, pks, action):
+    """Добавляет в журнал записи action для объектов model с ключами pks.
+
+    Вызывать в транзакции изменения: тогда запись журнала и изменение
+    фиксируются или откатываются вместе.
+    """
+
+    if model not in LOGGED_MODELS:
+        return
+    Change.objects.bulk_create(
+        (
+            Change(model=LOGGED_MODELS[model], object_id=pk, action=action)
+            for pk in pks
+        ),
+        batch_size=BATCH_SIZE
+    )
+
+
+def log_save(sender, instance, created, **kwargs):
+    if getattr(instance, 'is_deleted', False):
+        log_changes(sender, (instance.pk,), Change.Actions.DELETE)
+        if sender is Category:
+            log_changes(
+                Title,
+                Title.all_objects.filter(
+                    category=instance
+                ).values_list('pk', flat=True).iterator(),
+                Change.Actions.DELETE
+            )
+        return
+    action = Change.Actions.CREATE if created else Change.Actions.UPDATE
+    log_changes(sender, (instance.pk,), action)
+
+
+def log_delete(sender, instance, **kwargs):
+    log_changes(sender, (instance.pk,), Change.Actions.DELETE)
+
+
+def log_update(sender, pks, **kwargs):
+    log_changes(sender, pks, Change.Actions.UPDATE)
+
+
+for model in LOGGED_MODELS:
+    post_save.connect(log_save, sender=model)
+    post_delete.connect(log_delete, sender=model)
+    rows_updated.connect(log_update, sender=model)
@@ -15,6 +15,9 @@ LENGTH_FOR_FIELD = 150
 LIST_PER_PAGE = 10
 """Ограничение на количество отображаемых объектов."""
 
+MAX_PAGE_LIMIT = 100
+"""Максимальный размер страницы при пагинации по курсору."""
+
 SLICE = 20
 """Ограничение количества отображаемых символов в текстовом поле."""
 
@@ -32,5 +35,29 @@ SCORE_VALIDATOR_ERROR_MESSAGE = 'Score must be in range {} - {}.'.format(
 DEFAULT_RATING = 0
 """Значение для создания новой модели произведения."""
 
+MAX_BULK_SIZE = 10000
+"""Максимальное количество объектов в одном массовом запросе."""
+
+EXPORT_CHUNK_SIZE = 1000
+"""Количество строк, читаемых из БД за раз при выгрузке данных."""
+
+IMPORT_BATCH_SIZE = 1000
+"""Количество строк CSV, вставляемых в БД одной транзакцией при импорте."""
+
+MAX_REPORTED_IDS = 10
+"""Количество id строк, выводимых для одного нарушения проверки импорта."""
+
+PURGE_CHUNK_SIZE = 500
+"""Количество объектов, удаляемых за одну транзакцию фоновой очистки."""
+
+CHANGES_PAGE_SIZE = 100
+"""Размер порции журнала изменений по умолчанию."""
+
+MAX_CHANGES_LIMIT = 1000
+"""Максимальный размер порции журнала изменений."""
+
+TITLES_CACHE_TIMEOUT = 60 * 60
+"""Время хранения закэшированных ответов эндпоинта произведений."""
+
 APP_LABEL = 'reviews'
 """Название приложения для вызова класса модели."""
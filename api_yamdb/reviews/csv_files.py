@@ -0,0 +1,39 @@
+import gzip
+import io
+
+CSV_SUFFIX = '.csv'
+GZIP_SUFFIX = '.gz'
+
+
+def get_csv_name(model, compress=False):
+    """Возвращает имя файла модели: <модель>.csv или <модель>.csv.gz."""
+
+    name = model._meta.model_name + CSV_SUFFIX
+    return name + GZIP_SUFFIX if compress else name
+
+
+def get_model_name(path):
+    """Возвращает имя модели по имени CSV-файла или None."""
+
+    name = path.name
+    if name.endswith(GZIP_SUFFIX):
+        name = name[:-len(GZIP_SUFFIX)]
+    if not name.endswith(CSV_SUFFIX):
+        return None
+    return name[:-len(CSV_SUFFIX)]
+
+
+def open_csv(path, mode='r'):
+    """Открывает CSV-файл, сжатый gzip, если имя оканчивается на .gz.
+
+    Сжатый файл пишется с нулевым временем в заголовке, поэтому
+    одинаковые данные дают одинаковые файлы.
+    """
+
+    if not path.name.endswith(GZIP_SUFFIX):
+        return open(path, mode, newline='', encoding='utf-8')
+    return io.TextIOWrapper(
+        gzip.GzipFile(path, mode + 'b', mtime=0),
+        encoding='utf-8',
+        newline=''
+    )
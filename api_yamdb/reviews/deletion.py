@@ -0,0 +1,136 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, OuterRef, Q, Subquery
+
+from .constants import PURGE_CHUNK_SIZE
+from .fields import bulk_changed
+from .models import (ApiUser,
+                     Category,
+                     Comment,
+                     Review,
+                     Title,
+                     TitleScoreCount)
+
+logger = logging.getLogger(__name__)
+purge_lock = threading.Lock()
+
+
+def mark_deleted(instance):
+    """Помечает объект удалённым и планирует фоновую очистку.
+
+    Объект сразу пропадает из менеджеров objects, а зависимые записи
+    удаляет purge_deleted порциями, не нагружая запрос. Отзывы и
+    комментарии пользователя скрываются вместе с ним, а его оценки сразу
+    убираются из рейтингов.
+    """
+
+    instance.is_deleted = True
+    update_fields = ['is_deleted']
+    if isinstance(instance, ApiUser):
+        instance.is_active = False
+        update_fields.append('is_active')
+    with transaction.atomic():
+        instance.save(update_fields=update_fields)
+        if isinstance(instance, ApiUser):
+            remove_author_scores(instance)
+        transaction.on_commit(schedule_purge)
+
+
+def remove_author_scores(user):
+    """Убирает оценки пользователя из счётчиков рейтинга и гистограмм.
+
+    Число запросов не зависит от количества отзывов: счётчики меняются
+    одним UPDATE, гистограммы — одним UPDATE на каждую поставленную оценку.
+    У пользователя не больше одного отзыва на произведение.
+    """
+
+    reviews = Review.all_objects.filter(author=user)
+    Title.all_objects.filter(pk__in=reviews.values('title')).update(
+        rating_sum=F('rating_sum') - Subquery(
+            reviews.filter(title=OuterRef('pk')).values('score')[:1]
+        ),
+        rating_count=F('rating_count') - 1
+    )
+    for score in reviews.order_by().values_list(
+        'score', flat=True
+    ).distinct():
+        TitleScoreCount.objects.filter(
+            score=score, title__in=reviews.filter(score=score).values('title')
+        ).update(count=F('count') - 1)
+    bulk_changed.send(sender=ApiUser, models={Review, Comment})
+
+
+def schedule_purge():
+    if not settings.PURGE_DELETED_IN_BACKGROUND:
+        return
+    threading.Thread(target=run_purge, daemon=True).start()
+
+
+def run_purge():
+    with purge_lock:
+        try:
+            purge_deleted()
+        except Exception:
+            logger.exception('Purge of deleted objects failed')
+        finally:
+            connections.close_all()
+
+
+def delete_in_chunks(queryset, chunk_size=PURGE_CHUNK_SIZE):
+    """Удаляет объекты выборки порциями по chunk_size в своей транзакции.
+
+    Возвращает количество удалённых объектов модели выборки.
+    """
+
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                return deleted
+            _, counts = model._base_manager.filter(pk__in=pks).delete()
+        deleted += counts.get(model._meta.label, 0)
+
+
+def purge_titles(titles, chunk_size=PURGE_CHUNK_SIZE):
+    delete_in_chunks(
+        Comment.all_objects.filter(review__title__in=titles), chunk_size
+    )
+    delete_in_chunks(Review.all_objects.filter(title__in=titles), chunk_size)
+    return delete_in_chunks(titles, chunk_size)
+
+
+def purge_user(user, chunk_size=PURGE_CHUNK_SIZE):
+    delete_in_chunks(Comment.all_objects.filter(author=user), chunk_size)
+    delete_in_chunks(
+        Comment.all_objects.filter(review__author=user), chunk_size
+    )
+    delete_in_chunks(Review.all_objects.filter(author=user), chunk_size)
+    Title.all_objects.filter(author=user).update(author=None)
+    user.delete()
+
+
+def purge_deleted(chunk_size=PURGE_CHUNK_SIZE):
+    """Удаляет помеченные объекты вместе с зависимыми записями.
+
+    Возвращает словарь с количеством удалённых пользователей,
+    произведений и категорий.
+    """
+
+    users = list(ApiUser.all_objects.filter(is_deleted=True))
+    for user in users:
+        purge_user(user, chunk_size)
+    titles = purge_titles(
+        Title.all_objects.filter(
+            Q(is_deleted=True) | Q(category__is_deleted=True)
+        ),
+        chunk_size
+    )
+    categories = delete_in_chunks(
+        Category.all_objects.filter(is_deleted=True), chunk_size
+    )
+    return {'users': len(users), 'titles': titles, 'categories': categories}
@@ -0,0 +1,109 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from time import perf_counter
+
+from django.apps import apps
+from django.db import connections
+
+from .constants import APP_LABEL, EXPORT_CHUNK_SIZE
+from .csv_files import get_csv_name, open_csv
+from .models import Change, ImportedChunk, ImportedFile, TitleScoreCount
+
+# Служебные и вычисляемые таблицы: журнал изменений, контрольные суммы
+# импорта и гистограммы оценок, которые восстанавливает recount_ratings.
+EXCLUDED_MODELS = (Change, ImportedChunk, ImportedFile, TitleScoreCount)
+
+
+def get_export_models():
+    """Возвращает модели приложения, включая промежуточные таблицы
+    many-to-many, которые выгружаются в файлы."""
+
+    return [
+        model for model in apps.get_app_config(APP_LABEL).get_models(
+            include_auto_created=True
+        )
+        if model not in EXCLUDED_MODELS
+    ]
+
+
+def to_csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def export_model(model, path, chunk_size=EXPORT_CHUNK_SIZE):
+    """Выгружает все строки model в CSV-файл path.
+
+    Строки читаются курсором через iterator() порциями по chunk_size и
+    сразу пишутся в файл, поэтому память не зависит от размера таблицы.
+    Файл пишется под временным именем и переименовывается в конце.
+    Возвращает количество строк.
+    """
+
+    columns = [field.attname for field in model._meta.concrete_fields]
+    rows = model._base_manager.order_by('pk').values_list(
+        *columns
+    ).iterator(chunk_size=chunk_size)
+    temporary = path.with_name(f'.tmp-{path.name}')
+    count = 0
+    try:
+        with open_csv(temporary, 'w') as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(map(to_csv_value, row))
+                count += 1
+        os.replace(temporary, path)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+    return count
+
+
+def export_file(model, path, chunk_size):
+    """Выгружает модель в потоке пула и закрывает соединение потока."""
+
+    start = perf_counter()
+    try:
+        rows = export_model(model, path, chunk_size)
+    finally:
+        connections.close_all()
+    seconds = perf_counter() - start
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else 0,
+    }
+
+
+def export_models(models, data_dir, compress=False, jobs=1,
+                  chunk_size=EXPORT_CHUNK_SIZE, finished=None):
+    """Выгружает models в файлы data_dir в раскладке csv_import.
+
+    Файлы пишут jobs потоков, у каждого своё соединение с БД. finished
+    вызывается после каждого файла с моделью, путём и статистикой.
+    """
+
+    with ThreadPoolExecutor(jobs) as pool:
+        futures = {
+            pool.submit(
+                export_file,
+                model,
+                data_dir / get_csv_name(model, compress),
+                chunk_size
+            ): model
+            for model in models
+        }
+        for future in as_completed(futures):
+            model = futures[future]
+            if finished is not None:
+                finished(
+                    model,
+                    data_dir / get_csv_name(model, compress),
+                    future.result()
+                )
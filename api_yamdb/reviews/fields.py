@@ -0,0 +1,129 @@
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .search import normalize_search_text
+
+
+class SearchField(models.CharField):
+    """Индексируемая нормализованная копия текстового поля модели."""
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def normalize(self, value):
+        return normalize_search_text(value)[:self.max_length]
+
+    def pre_save(self, model_instance, add):
+        value = self.normalize(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def get_search_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, SearchField)
+    ]
+
+
+class SearchFieldsMixin:
+    """Добавляет нормализованные поля в save(update_fields=...)."""
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                field.name for field in get_search_fields(type(self))
+                if field.source in update_fields
+            }
+        super().save(*args, **kwargs)
+
+
+# Отправляется после update() и bulk_update() модели с updated_at,
+# аргумент pks содержит первичные ключи изменённых строк.
+rows_updated = Signal()
+
+# Отправляется после массовых изменений в обход сигналов моделей (загрузка
+# CSV, пересчёт рейтингов), аргумент models содержит изменённые модели.
+bulk_changed = Signal()
+
+
+def is_tracked(model):
+    return any(
+        field.name == 'updated_at' for field in model._meta.concrete_fields
+    )
+
+
+class TrackedQuerySet(models.QuerySet):
+    """Обновляет updated_at в update и bulk_update, если поле есть.
+
+    auto_now срабатывает только в save и bulk_create. update() без
+    аргументов лишь отмечает строки изменёнными. Изменённые ключи
+    передаются сигналу rows_updated в той же транзакции.
+    """
+
+    def update(self, **kwargs):
+        if not is_tracked(self.model):
+            return super().update(**kwargs)
+        kwargs.setdefault('updated_at', timezone.now())
+        if not rows_updated.has_listeners(self.model):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            rows_updated.send(sender=self.model, pks=pks)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        # Django выполняет bulk_update через update() этого же класса,
+        # поэтому rows_updated отправляется там.
+        objs = list(objs)
+        fields = list(fields)
+        if is_tracked(self.model) and 'updated_at' not in fields:
+            fields.append('updated_at')
+            now = timezone.now()
+            for obj in objs:
+                obj.updated_at = now
+        return super().bulk_update(objs, fields, batch_size=batch_size)
+
+    bulk_update.alters_data = True
+
+
+class SearchQuerySet(TrackedQuerySet):
+    """Поддерживает нормализованные поля в массовых операциях.
+
+    bulk_create заполняет их через SearchField.pre_save, а update и
+    bulk_update дополняются здесь.
+    """
+
+    def update(self, **kwargs):
+        for field in get_search_fields(self.model):
+            if isinstance(kwargs.get(field.source), str):
+                kwargs[field.name] = field.normalize(kwargs[field.source])
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        fields = list(fields)
+        for field in get_search_fields(self.model):
+            if field.source in fields and field.name not in fields:
+                fields.append(field.name)
+                for obj in objs:
+                    field.pre_save(obj, add=False)
+        return super().bulk_update(objs, fields, batch_size=batch_size)
+
+    bulk_update.alters_data = True
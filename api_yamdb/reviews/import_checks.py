@@ -0,0 +1,273 @@
+import csv
+import warnings
+from graphlib import TopologicalSorter
+from operator import itemgetter
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+from .csv_files import open_csv
+from .importing import get_dependencies
+from .validators import get_max_year, year_validator
+
+# Проверки валидаторов-функций над массивом значений: (нарушение, текст).
+ARRAY_VALIDATORS = {
+    year_validator: (
+        lambda values: values > get_max_year(), 'Invalid year.'
+    ),
+}
+
+
+def read_columns(path, names):
+    """Читает из CSV-файла только столбцы names.
+
+    Возвращает заголовок файла и словарь {столбец: кортеж строк}.
+    """
+
+    with open_csv(path) as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        names = [name for name in names if name in header]
+        indexes = [header.index(name) for name in names]
+        getter = itemgetter(*indexes, 0)
+
+        def pick(row):
+            try:
+                return getter(row)
+            except IndexError:
+                return getter(row + [''] * len(header))
+
+        # Последний столбец добавлен, чтобы getter всегда возвращал кортеж.
+        columns = tuple(
+            zip(*map(pick, filter(None, reader)))
+        )[:-1] or ((),) * len(names)
+    return header, dict(zip(names, columns))
+
+
+def parse_ints(values):
+    """Возвращает массив целых чисел и маску строк, которые ими не являются.
+
+    Столбец без ошибок разбирается целиком, иначе ошибки ищутся по
+    массиву строк. На месте некорректных значений в массиве стоит 0.
+    """
+
+    try:
+        return (
+            np.fromiter(map(int, values), dtype=np.int64, count=len(values)),
+            np.zeros(len(values), dtype=bool)
+        )
+    except (ValueError, OverflowError):
+        pass
+    values = np.char.strip(np.array(values, dtype=str))
+    negative = np.char.startswith(values, '-')
+    digits = np.where(negative, np.char.replace(values, '-', '', 1), values)
+    valid = np.char.isdigit(digits) & (np.char.str_len(digits) <= 18)
+    return np.where(valid, values, '0').astype(np.int64), ~valid
+
+
+def parse_datetimes(field, values):
+    """Возвращает маску значений, которые field не может разобрать.
+
+    Столбец сначала разбирается целиком через datetime64, и только при
+    ошибке значения проверяются по одному методом to_python поля.
+    """
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            np.array(values, dtype='datetime64[us]')
+        return np.zeros(len(values), dtype=bool)
+    except ValueError:
+        pass
+    invalid = np.zeros(len(values), dtype=bool)
+    for index, value in enumerate(values):
+        try:
+            field.to_python(value)
+        except ValidationError:
+            invalid[index] = True
+    return invalid
+
+
+def is_member(known, values):
+    """Проверяет вхождение values в отсортированный массив known."""
+
+    if not len(known):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(known, values)
+    return known[np.minimum(positions, len(known) - 1)] == values
+
+
+def find_duplicates(columns):
+    """Возвращает маску строк, значения columns которых повторяются."""
+
+    order = np.lexsort(columns[::-1])
+    same = np.ones(len(order) - 1 if len(order) else 0, dtype=bool)
+    for column in columns:
+        column = column[order]
+        same &= column[1:] == column[:-1]
+    duplicates = np.zeros(len(order), dtype=bool)
+    duplicates[order[1:][same]] = True
+    duplicates[order[:-1][same]] = True
+    return duplicates
+
+
+def get_unique_sets(model):
+    """Возвращает наборы полей модели, значения которых уникальны."""
+
+    unique_sets = [
+        (field.attname,) for field in model._meta.concrete_fields
+        if field.unique
+    ]
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint):
+            unique_sets.append(tuple(
+                model._meta.get_field(name).attname
+                for name in constraint.fields
+            ))
+    return unique_sets
+
+
+def get_checked_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if field.is_relation or field.unique
+        or isinstance(field, (models.IntegerField, models.DateField))
+    ]
+
+
+class FileCheck:
+    """Проверка одного CSV-файла модели по столбцам.
+
+    Нарушения собираются в violations парами (текст, id строк), ключи
+    строк файла — в ids.
+    """
+
+    def __init__(self, model, path, known_ids):
+        self.model = model
+        self.known_ids = known_ids
+        self.violations = []
+        self.fields = get_checked_fields(model)
+        self.header, self.columns = read_columns(
+            path, [field.attname for field in self.fields]
+        )
+        self.ints = {}
+        self.ids = np.array([], dtype=np.int64)
+
+    @property
+    def row_ids(self):
+        pk = self.model._meta.pk.attname
+        if pk in self.columns:
+            return np.array(self.columns[pk], dtype=str)
+        rows = max(map(len, self.columns.values()), default=0)
+        return np.arange(1, rows + 1).astype(str)
+
+    def add(self, message, invalid):
+        if invalid.any():
+            self.violations.append((message, self.row_ids[invalid]))
+
+    def run(self):
+        known = {field.attname for field in self.model._meta.concrete_fields}
+        for name in self.header:
+            if name not in known:
+                self.violations.append((f'Unknown column: {name}.', []))
+        for field in self.fields:
+            if field.attname in self.columns:
+                self.check_field(field, self.columns[field.attname])
+        for names in get_unique_sets(self.model):
+            if all(name in self.columns for name in names):
+                self.check_unique(names)
+        return self.violations
+
+    def check_unique(self, names):
+        """Ищет повторы среди строк с корректными целыми значениями."""
+
+        rows = np.ones(len(self.columns[names[0]]), dtype=bool)
+        for name in names:
+            if name in self.ints:
+                rows &= self.ints[name][1]
+        columns = [
+            self.ints[name][0] if name in self.ints
+            else np.array(self.columns[name], dtype=str)
+            for name in names
+        ]
+        duplicates = np.zeros(len(rows), dtype=bool)
+        duplicates[rows] = find_duplicates(
+            [column[rows] for column in columns]
+        )
+        self.add(f'Duplicate values of {", ".join(names)}.', duplicates)
+
+    def check_field(self, field, values):
+        target = field.target_field if field.is_relation else field
+        empty = (
+            np.array(values, dtype=str) == '' if '' in values
+            else np.zeros(len(values), dtype=bool)
+        )
+        if isinstance(target, models.DateField):
+            invalid = parse_datetimes(target, values)
+            self.add(f'{field.attname}: invalid date.',
+                     invalid & ~empty if field.null else invalid | empty)
+        if not isinstance(target, models.IntegerField):
+            return
+        ints, invalid = parse_ints(values)
+        if field.null:
+            invalid &= ~empty
+        self.add(f'{field.attname}: not an integer.', invalid)
+        valid = ~(invalid | empty)
+        self.ints[field.attname] = ints, valid
+        if field.primary_key:
+            self.ids = np.unique(ints[valid])
+        if field.is_relation:
+            self.add(
+                f'{field.attname}: unknown '
+                f'{field.related_model._meta.model_name}.',
+                valid & ~is_member(
+                    self.known_ids(field.related_model), ints
+                )
+            )
+        self.check_validators(field, ints, valid)
+
+    def check_validators(self, field, ints, valid):
+        for validator in field.validators:
+            if isinstance(validator, (MinValueValidator, MaxValueValidator)):
+                limit = validator.limit_value
+                if callable(limit):
+                    limit = limit()
+                self.add(
+                    f'{field.attname}: '
+                    f'{validator.message % {"limit_value": limit}}',
+                    valid & validator.compare(ints, limit)
+                )
+            elif validator in ARRAY_VALIDATORS:
+                check, message = ARRAY_VALIDATORS[validator]
+                self.add(f'{field.attname}: {message}', valid & check(ints))
+
+
+def check_files(files):
+    """Проверяет файлы {модель: путь} до загрузки.
+
+    Внешние ключи сверяются с id из файлов и из БД. Возвращает словарь
+    {модель: [(текст нарушения, id строк), ...]} для файлов с нарушениями.
+    """
+
+    ids = {}
+
+    def known_ids(model):
+        if model not in ids:
+            ids[model] = np.fromiter(
+                model._base_manager.order_by('pk').values_list(
+                    'pk', flat=True
+                ).iterator(),
+                dtype=np.int64
+            )
+        return ids[model]
+
+    violations = {}
+    for model in TopologicalSorter(get_dependencies(files)).static_order():
+        check = FileCheck(model, files[model], known_ids)
+        found = check.run()
+        if found:
+            violations[model] = found
+        ids[model] = np.union1d(known_ids(model), check.ids)
+    return violations
@@ -0,0 +1,528 @@
+import csv
+import hashlib
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED,
+                                Future,
+                                ProcessPoolExecutor,
+                                wait)
+from graphlib import TopologicalSorter
+from itertools import islice
+from time import perf_counter
+
+import django
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from rest_framework import serializers
+
+from .changes import log_changes
+from .constants import APP_LABEL, IMPORT_BATCH_SIZE
+from .csv_files import get_model_name, open_csv
+from .fields import is_tracked
+from .models import Change, ImportedChunk, ImportedFile
+
+CHECKSUM_BLOCK_SIZE = 1 << 20
+
+
+def get_import_files(data_dir):
+    """Сопоставляет файлы data_dir вида <модель>.csv или <модель>.csv.gz
+    моделям приложения.
+
+    Возвращает словарь {модель: путь} и список пар (путь, причина) для
+    пропущенных файлов.
+    """
+
+    files, skipped = {}, []
+    for path in sorted(data_dir.iterdir()):
+        model_name = get_model_name(path)
+        if model_name is None:
+            continue
+        try:
+            model = apps.get_model(APP_LABEL, model_name)
+        except LookupError:
+            skipped.append((path, 'unknown model'))
+            continue
+        if model in files:
+            skipped.append((path, f'duplicate of {files[model].name}'))
+            continue
+        files[model] = path
+    return files, skipped
+
+
+def get_dependencies(models):
+    """Возвращает для каждой модели модели из models, на которые она
+    ссылается внешними ключами."""
+
+    return {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.many_to_one and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+
+
+def read_batches(path, batch_size=IMPORT_BATCH_SIZE):
+    """Читает CSV-файл потоком и выдаёт строки порциями по batch_size."""
+
+    with open_csv(path) as file:
+        rows = csv.DictReader(file)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
+
+
+def setup_worker():
+    if not apps.ready:
+        django.setup()
+
+
+def clean_value(fields, name, value):
+    if name not in fields:
+        raise ValidationError(f'Unknown column: {name}.')
+    field = fields[name]
+    if value == '':
+        # Пустая строка выгружается вместо NULL, а в текстовых полях
+        # хранится как есть, даже если формы требуют значение.
+        if field.null and not (field.empty_strings_allowed and field.blank):
+            return None
+        if field.empty_strings_allowed:
+            return value
+    if field.is_relation:
+        return field.target_field.to_python(value)
+    try:
+        return field.clean(value, None)
+    except serializers.ValidationError as error:
+        raise ValidationError(
+            [str(message) for message in error.detail]
+        )
+
+
+def clean_rows(model_label, rows):
+    """Приводит значения строк CSV к типам полей модели и проверяет их
+    валидаторами полей.
+
+    Выполняется в процессах-обработчиках. Возвращает очищенные строки и
+    список пар (id, ошибки) для отброшенных строк.
+    """
+
+    model = apps.get_model(model_label)
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    cleaned, errors = [], []
+    for row in rows:
+        try:
+            cleaned.append({
+                name: clean_value(fields, name, value)
+                for name, value in row.items()
+            })
+        except ValidationError as error:
+            errors.append((row.get('id'), ' '.join(error.messages)))
+    return cleaned, errors
+
+
+def drop_unknown_references(model, rows):
+    """Отбрасывает строки со ссылками на несуществующие объекты.
+
+    SQLite проверяет внешние ключи при фиксации транзакции, и одна такая
+    строка откатила бы всю порцию. Возвращает оставшиеся строки и список
+    пар (id, ошибка) для отброшенных.
+    """
+
+    errors = []
+    for field in model._meta.concrete_fields:
+        if not (field.many_to_one and rows and field.attname in rows[0]):
+            continue
+        target = field.target_field.attname
+        known = set(field.related_model._base_manager.filter(**{
+            f'{target}__in': {row[field.attname] for row in rows} - {None}
+        }).values_list(target, flat=True))
+        message = (
+            f'{field.attname}: unknown {field.related_model._meta.model_name}.'
+        )
+        kept = []
+        for row in rows:
+            if row[field.attname] is None or row[field.attname] in known:
+                kept.append(row)
+            else:
+                errors.append((row.get('id'), message))
+        rows = kept
+    return rows, errors
+
+
+def get_objects(model, rows):
+    objs = [model(**row) for row in rows]
+    pk_field = model._meta.pk
+    return objs, [pk_field.to_python(obj.pk) for obj in objs]
+
+
+def restore_creation_dates(model, objs, dates, inserted):
+    """Возвращает добавленным объектам даты создания из файла.
+
+    bulk_create заменяет значения полей auto_now_add текущим временем.
+    Обновление идёт через простой QuerySet, чтобы не менять updated_at и
+    не писать изменения в журнал.
+    """
+
+    names = [
+        name for name, value in zip(dates, objs[0][1]) if value is not None
+    ]
+    if not names:
+        return
+    inserted = set(inserted)
+    restored = []
+    for obj, values in objs:
+        if obj.pk in inserted:
+            for name, value in zip(dates, values):
+                if name in names:
+                    setattr(obj, name, value)
+            restored.append(obj)
+    if restored:
+        models.QuerySet(model).bulk_update(
+            restored, names, batch_size=len(restored)
+        )
+
+
+def create_new(model, objs, pks, existing):
+    """Вставляет объекты, ключей которых нет в existing.
+
+    Даты создания из файла сохраняются. Возвращает ключи добавленных
+    объектов.
+    """
+
+    manager = model._base_manager
+    new_pks = [pk for pk in pks if pk not in existing]
+    dates = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    new_objs = [
+        (obj, [getattr(obj, name) for name in dates])
+        for obj, pk in zip(objs, pks) if pk not in existing
+    ]
+    manager.bulk_create(
+        (obj for obj, _ in new_objs),
+        batch_size=max(len(objs), 1),
+        ignore_conflicts=True
+    )
+    inserted = list(
+        manager.filter(pk__in=new_pks).values_list('pk', flat=True)
+    )
+    if dates and new_objs:
+        restore_creation_dates(model, new_objs, dates, inserted)
+    log_changes(model, inserted, Change.Actions.CREATE)
+    return inserted
+
+
+def insert_batch(model, rows):
+    """Вставляет порцию строк одной транзакцией.
+
+    Строки с уже существующими id, как и строки, нарушающие другие
+    ограничения уникальности, пропускаются. Возвращает списки ключей
+    добавленных объектов и объектов, которые уже были в БД.
+    """
+
+    objs, pks = get_objects(model, rows)
+    with transaction.atomic():
+        existing = set(
+            model._base_manager.filter(pk__in=pks).values_list(
+                'pk', flat=True
+            )
+        )
+        inserted = create_new(model, objs, pks, existing)
+    return inserted, [pk for pk in pks if pk in existing]
+
+
+def get_update_fields(model, columns):
+    return [
+        field for field in model._meta.concrete_fields
+        if field.editable and not field.primary_key
+        and field.attname in columns
+    ]
+
+
+def upsert_batch(model, rows):
+    """Вставляет новые строки порции и обновляет изменившиеся.
+
+    Обновляются только редактируемые поля из столбцов файла и только у
+    объектов, значения которых отличаются от БД. Возвращает списки ключей
+    добавленных, изменённых и совпавших с БД объектов.
+    """
+
+    if not rows:
+        return [], [], []
+    objs, pks = get_objects(model, rows)
+    fields = get_update_fields(model, rows[0])
+    attnames = [field.attname for field in fields]
+    with transaction.atomic():
+        stored = {
+            pk: values for pk, *values in model._base_manager.filter(
+                pk__in=pks
+            ).values_list('pk', *attnames)
+        }
+        inserted = create_new(model, objs, pks, stored)
+        changed = [
+            obj for obj, pk in zip(objs, pks) if pk in stored
+            and [getattr(obj, name) for name in attnames] != stored[pk]
+        ]
+        if changed:
+            model._default_manager.bulk_update(
+                changed, [field.name for field in fields],
+                batch_size=len(changed)
+            )
+            if not is_tracked(model):
+                log_changes(
+                    model, [obj.pk for obj in changed], Change.Actions.UPDATE
+                )
+    changed_pks = {obj.pk for obj in changed}
+    return inserted, list(changed_pks), [
+        pk for pk in pks if pk in stored and pk not in changed_pks
+    ]
+
+
+def file_checksum(path):
+    checksum = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(CHECKSUM_BLOCK_SIZE), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+def batch_checksum(batch):
+    checksum = hashlib.sha1()
+    for row in batch:
+        checksum.update('\x1f'.join(map(str, row.items())).encode())
+        checksum.update(b'\x1e')
+    return checksum.hexdigest()
+
+
+def run_now(function, *args):
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+
+class FileImport:
+    """Загрузка одного файла: читатель порций, порции в обработке и
+    статистика. Порции только добавляют новые объекты."""
+
+    # Счётчик статистики для строк, объекты которых уже есть в БД.
+    existing_stat = 'skipped'
+
+    def __init__(self, model, path, batch_size):
+        self.model = model
+        self.batches = enumerate(read_batches(path, batch_size))
+        self.pending = deque()
+        self.exhausted = False
+        self.start = perf_counter()
+        self.stats = {
+            'rows': 0,
+            'inserted': 0,
+            'updated': 0,
+            'skipped': 0,
+            'unchanged': 0,
+            'invalid': 0,
+            'file_unchanged': False,
+            'seconds': 0.0,
+            'rows_per_second': 0.0,
+        }
+
+    def next_batch(self):
+        """Возвращает (номер, порция, контрольная сумма) или None."""
+
+        number, batch = next(self.batches, (None, None))
+        if batch is None:
+            return None
+        return number, batch, None
+
+    def submit(self, submit):
+        """Отправляет следующую порцию в обработку, если она есть."""
+
+        batch = None if self.exhausted else self.next_batch()
+        if batch is None:
+            self.exhausted = True
+            return False
+        number, rows, checksum = batch
+        self.pending.append((
+            number,
+            checksum,
+            submit(clean_rows, self.model._meta.label, rows)
+        ))
+        return True
+
+    @property
+    def finished(self):
+        return self.exhausted and not self.pending
+
+    def write(self, number, checksum, rows, errors):
+        """Записывает порцию, возвращает ключи добавленных, изменённых и
+        уже существовавших объектов."""
+
+        inserted, existing = insert_batch(self.model, rows)
+        return inserted, [], existing
+
+    def write_ready(self, progress):
+        """Записывает обработанные порции в порядке чтения."""
+
+        while self.pending and self.pending[0][2].done():
+            number, checksum, future = self.pending.popleft()
+            rows, errors = future.result()
+            rows, unknown = drop_unknown_references(self.model, rows)
+            errors += unknown
+            inserted, updated, existing = self.write(
+                number, checksum, rows, errors
+            )
+            stats = self.stats
+            stats['rows'] += len(rows) + len(errors)
+            stats['inserted'] += len(inserted)
+            stats['updated'] += len(updated)
+            stats[self.existing_stat] += len(existing)
+            stats['skipped'] += (
+                len(rows) - len(inserted) - len(updated) - len(existing)
+            )
+            stats['invalid'] += len(errors)
+            self.update_speed()
+            if progress is not None:
+                progress(self.model, stats, existing, errors)
+
+    def update_speed(self):
+        stats = self.stats
+        stats['seconds'] = perf_counter() - self.start
+        stats['rows_per_second'] = (
+            stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        )
+
+    def finish(self):
+        self.update_speed()
+
+
+class FileUpsert(FileImport):
+    """Загрузка файла с обновлением изменившихся объектов.
+
+    Контрольные суммы файла и его порций сохраняются после загрузки.
+    Файл, совпавший с прошлой загрузкой, не читается, а порции с прежней
+    контрольной суммой не разбираются и не записываются.
+    """
+
+    existing_stat = 'unchanged'
+
+    def __init__(self, model, path, batch_size):
+        super().__init__(model, path, batch_size)
+        self.batch_size = batch_size
+        self.checksum = file_checksum(path)
+        self.invalid_chunks = False
+        self.record, _ = ImportedFile.objects.get_or_create(
+            name=path.name,
+            defaults={'checksum': '', 'batch_size': batch_size}
+        )
+        if self.record.batch_size != batch_size:
+            # Границы порций сдвинулись, прежние суммы не подходят.
+            self.record.chunks.all().delete()
+        elif self.record.checksum == self.checksum:
+            self.exhausted = True
+            self.stats['file_unchanged'] = True
+        self.chunks = dict(
+            self.record.chunks.values_list('number', 'checksum')
+        )
+        self.last_number = -1
+
+    def next_batch(self):
+        for number, batch in self.batches:
+            self.last_number = number
+            checksum = batch_checksum(batch)
+            if self.chunks.get(number) != checksum:
+                return number, batch, checksum
+            self.stats['rows'] += len(batch)
+            self.stats['unchanged'] += len(batch)
+        return None
+
+    def write(self, number, checksum, rows, errors):
+        with transaction.atomic():
+            result = upsert_batch(self.model, rows)
+            if errors:
+                self.invalid_chunks = True
+            else:
+                ImportedChunk.objects.update_or_create(
+                    file=self.record, number=number,
+                    defaults={'checksum': checksum}
+                )
+        return result
+
+    def finish(self):
+        super().finish()
+        if self.stats['file_unchanged']:
+            return
+        with transaction.atomic():
+            self.record.chunks.filter(number__gt=self.last_number).delete()
+            self.record.batch_size = self.batch_size
+            self.record.checksum = (
+                '' if self.invalid_chunks else self.checksum
+            )
+            self.record.save()
+
+
+def fill_pending(imports, submit, limit):
+    """Отправляет порции готовых к загрузке файлов по очереди, пока в
+    обработке меньше limit порций."""
+
+    in_flight = sum(len(file_import.pending) for file_import in imports)
+    while in_flight < limit:
+        submitted = False
+        for file_import in imports:
+            if in_flight < limit and file_import.submit(submit):
+                in_flight += 1
+                submitted = True
+        if not submitted:
+            return
+
+
+def import_files(files, batch_size=IMPORT_BATCH_SIZE, jobs=1,
+                 progress=None, finished=None, upsert=False):
+    """Загружает файлы {модель: путь} с учётом внешних ключей.
+
+    Файл начинает загружаться, когда загружены все файлы моделей, на
+    которые он ссылается, поэтому независимые файлы обрабатываются
+    одновременно. Строки разбирают и проверяют jobs процессов, а
+    записывает порции только текущий процесс: SQLite
+    допускает одного писателя. С upsert изменившиеся объекты обновляются,
+    а порции, не изменившиеся с прошлой загрузки, пропускаются.
+    progress вызывается после каждой порции, finished — после каждого
+    файла.
+    """
+
+    file_class = FileUpsert if upsert else FileImport
+
+    graph = TopologicalSorter(get_dependencies(files))
+    graph.prepare()
+    pool = (
+        ProcessPoolExecutor(jobs, initializer=setup_worker)
+        if jobs > 1 else None
+    )
+    submit = pool.submit if pool is not None else run_now
+    imports = []
+    try:
+        while graph.is_active():
+            imports.extend(
+                file_class(model, files[model], batch_size)
+                for model in graph.get_ready()
+            )
+            fill_pending(imports, submit, jobs * 2)
+            pending = [
+                future for file_import in imports
+                for _, _, future in file_import.pending
+            ]
+            if pending:
+                wait(pending, return_when=FIRST_COMPLETED)
+            for file_import in list(imports):
+                file_import.write_ready(progress)
+                if file_import.finished:
+                    file_import.finish()
+                    imports.remove(file_import)
+                    graph.done(file_import.model)
+                    if finished is not None:
+                        finished(file_import.model, file_import.stats)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.constants import EXPORT_CHUNK_SIZE
+from reviews.exporting import export_models, get_export_models
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает данные всех моделей в CSV-файлы <модель>.csv, которые '
+        'можно загрузить обратно командой csv_import.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            type=Path,
+            required=True,
+            help='Папка, в которую записываются файлы.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы gzip (<модель>.csv.gz).'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за раз.'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Количество файлов, записываемых одновременно.'
+        )
+
+    def finished(self, model, path, stats):
+        self.stdout.write(
+            f'Data export finished for model: {model._meta.model_name}: '
+            '{rows} rows in {seconds:.2f}s '
+            '({rows_per_second:.0f} rows/s)'.format(**stats)
+            + f' to {path.name}'
+        )
+
+    def handle(self, **options):
+        if options['chunk_size'] <= 0 or options['jobs'] <= 0:
+            raise CommandError('--chunk-size and --jobs must be positive.')
+        data_dir = options['data_dir']
+        data_dir.mkdir(parents=True, exist_ok=True)
+        export_models(
+            get_export_models(),
+            data_dir,
+            options['gzip'],
+            options['jobs'],
+            options['chunk_size'],
+            self.finished
+        )
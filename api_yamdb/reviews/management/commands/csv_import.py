@@ -1,48 +1,133 @@
+import os
 from pathlib import Path
-import csv
-from sqlite3 import IntegrityError
 
-from django.core.management.base import BaseCommand
-from django.apps import apps
-from django.db.utils import IntegrityError
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
 
-from reviews.constants import APP_LABEL
+from reviews.constants import IMPORT_BATCH_SIZE, MAX_REPORTED_IDS
+from reviews.fields import bulk_changed
+from reviews.import_checks import check_files
+from reviews.importing import get_import_files, import_files
 
 
-class FileOpenException(Exception):
-    """Вызов исключения при некорректном открытии файла."""
-    pass
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из CSV-файлов порциями через bulk_create. Файл '
+        'модели загружается после файлов моделей, на которые она '
+        'ссылается. Объекты с уже существующими id пропускаются.'
+    )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            type=Path,
+            default=settings.BASE_DIR / 'static' / 'data',
+            help='Папка с файлами <модель>.csv или <модель>.csv.gz.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество строк, вставляемых одной транзакцией.'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Количество процессов, разбирающих строки файлов.'
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Обновлять изменившиеся объекты, пропуская файлы и порции, '
+                 'не изменившиеся с прошлой загрузки с --upsert.'
+        )
+        parser.add_argument(
+            '--validate',
+            action='store_true',
+            help='Проверить все файлы и загрузить их, только если '
+                 'нарушений нет.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только проверить файлы, ничего не загружая.'
+        )
+
+    def progress(self, model, stats, existing, errors):
+        model_name = model._meta.model_name
+        for pk, message in errors:
+            self.stdout.write(
+                f'Object {model_name} ID:{pk} invalid: {message}'
+            )
+        if self.verbosity > 1:
+            for pk in existing:
+                self.stdout.write(
+                    f'Object {model_name} ID:{pk} already exists'
+                )
+        if self.verbosity > 0:
+            self.stdout.write(
+                f'{model_name}: {stats["rows"]} rows, '
+                f'{stats["rows_per_second"]:.0f} rows/s'
+            )
+
+    def finished(self, model, stats):
+        model_name = model._meta.model_name
+        if stats['file_unchanged']:
+            self.stdout.write(
+                f'Data import skipped for model: {model_name}: '
+                'file unchanged'
+            )
+            return
+        counts = '{rows} rows, {inserted} inserted, '
+        if self.upsert:
+            counts += '{updated} updated, {unchanged} unchanged, '
+        self.stdout.write(
+            f'Data import finished for model: {model_name}: '
+            + (
+                counts + '{skipped} skipped, {invalid} invalid in '
+                '{seconds:.2f}s ({rows_per_second:.0f} rows/s)'
+            ).format(**stats)
+        )
+
+    def validate(self, files):
+        violations = check_files(files)
+        for model, found in violations.items():
+            for message, ids in found:
+                shown = ', '.join(ids[:MAX_REPORTED_IDS])
+                if len(ids) > MAX_REPORTED_IDS:
+                    shown += ', ...'
+                self.stdout.write(
+                    f'{files[model].name}: {message} '
+                    f'{len(ids)} rows (ID: {shown})' if len(ids) else
+                    f'{files[model].name}: {message}'
+                )
+        count = sum(len(found) for found in violations.values())
+        if count:
+            raise CommandError(f'Validation failed: {count} violations.')
+        self.stdout.write('Validation passed')
 
-class Command(BaseCommand):
     def handle(self, **options):
-        files = [
-            'apiuser.csv',
-            'category.csv',
-            'genre.csv',
-            'title.csv',
-            'title_genre.csv',
-            'review.csv',
-            'comment.csv',
-        ]
-        for file in files:
-            model_name = Path(file).stem
-            model_class = apps.get_model(APP_LABEL, model_name)
-            try:
-                with open(f'static/data/{file}', newline='') as f:
-                    dataframe = csv.DictReader(f)
-                    for row in dataframe:
-                        try:
-                            model_class.objects.create(**row)
-                        except IntegrityError:
-                            self.stdout.write(
-                                f'Object {model_name} ID:'
-                                f'{row.get("id")} already exists'
-                            )
-                            continue
-                    self.stdout.write(
-                        f'Data import finished for model: {model_name}'
-                    )
-            except FileOpenException as error:
-                self.stdout.write(f'Ошибка при открытии файла: {error}')
-                continue
+        data_dir, batch_size = options['data_dir'], options['batch_size']
+        self.verbosity, self.upsert = options['verbosity'], options['upsert']
+        if batch_size <= 0 or options['jobs'] <= 0:
+            raise CommandError('--batch-size and --jobs must be positive.')
+        if not data_dir.is_dir():
+            raise CommandError(f'Data directory {data_dir} does not exist.')
+        files, skipped = get_import_files(data_dir)
+        for path, reason in skipped:
+            self.stdout.write(f'File {path.name} skipped: {reason}')
+        if options['validate'] or options['dry_run']:
+            self.validate(files)
+        if options['dry_run']:
+            return
+        import_files(
+            files, batch_size, options['jobs'], self.progress, self.finished,
+            self.upsert
+        )
+        # bulk_create не отправляет post_save: счётчики рейтинга
+        # пересчитываются и об изменениях сообщается после загрузки всех
+        # файлов.
+        call_command('recount_ratings', verbosity=0, stdout=self.stdout)
+        bulk_changed.send(sender=self.__class__, models=set(files))
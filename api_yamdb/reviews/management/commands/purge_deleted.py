@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import PURGE_CHUNK_SIZE
+from reviews.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет помеченные на удаление пользователей, произведения и '
+        'категории вместе с зависимыми записями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=PURGE_CHUNK_SIZE,
+            help='Количество объектов, удаляемых за одну транзакцию.'
+        )
+
+    def handle(self, **options):
+        purged = purge_deleted(options['chunk_size'])
+        self.stdout.write(
+            'Purge finished: {users} users, {titles} titles, '
+            '{categories} categories'.format(**purged)
+        )
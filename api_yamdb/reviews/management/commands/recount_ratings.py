@@ -0,0 +1,82 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from reviews.fields import bulk_changed
+from reviews.models import Review, Title, TitleScoreCount
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает хранимые счётчики рейтинга и гистограммы оценок '
+        'произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, не исправляя их.'
+        )
+
+    def handle(self, **options):
+        with transaction.atomic():
+            actual = defaultdict(dict)
+            for title_id, score, count in Review.objects.values_list(
+                'title_id', 'score'
+            ).annotate(count=Count('id')).order_by():
+                actual[title_id][score] = count
+            stored = defaultdict(dict)
+            for title_id, score, count in TitleScoreCount.objects.filter(
+                count__gt=0
+            ).values_list('title_id', 'score', 'count'):
+                stored[title_id][score] = count
+
+            drifted = []
+            for title in Title.all_objects.only(
+                'id', 'rating_sum', 'rating_count'
+            ).iterator():
+                histogram = actual.get(title.pk, {})
+                expected = (
+                    sum(score * count for score, count in histogram.items()),
+                    sum(histogram.values())
+                )
+                if (
+                    (title.rating_sum, title.rating_count) != expected
+                    or stored.get(title.pk, {}) != histogram
+                ):
+                    title.rating_sum, title.rating_count = expected
+                    drifted.append(title)
+
+            if not options['check']:
+                Title.all_objects.bulk_update(
+                    drifted, ('rating_sum', 'rating_count'),
+                    batch_size=BATCH_SIZE
+                )
+                for start in range(0, len(drifted), BATCH_SIZE):
+                    TitleScoreCount.objects.filter(
+                        title__in=drifted[start:start + BATCH_SIZE]
+                    ).delete()
+                TitleScoreCount.objects.bulk_create(
+                    (
+                        TitleScoreCount(title=title, score=score, count=count)
+                        for title in drifted
+                        for score, count in actual.get(title.pk, {}).items()
+                    ),
+                    batch_size=BATCH_SIZE
+                )
+        if drifted and not options['check']:
+            bulk_changed.send(sender=self.__class__, models={Title})
+        if options['verbosity'] > 0:
+            for title in drifted:
+                self.stdout.write(
+                    f'Title ID:{title.pk} rating counters drifted'
+                )
+        action = 'found' if options['check'] else 'fixed'
+        self.stdout.write(
+            f'Rating recount finished: {len(drifted)} titles {action}'
+        )
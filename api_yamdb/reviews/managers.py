@@ -0,0 +1,31 @@
+from django.contrib.auth.models import UserManager
+from django.db import models
+
+from .fields import SearchQuerySet
+
+
+class AliveManager(models.Manager.from_queryset(SearchQuerySet)):
+    """Скрывает объекты, помеченные на удаление, и зависящие от них.
+
+    Флаги перечисляются lookup-ами, например 'category__is_deleted'.
+    """
+
+    def __init__(self, *deleted_flags):
+        super().__init__()
+        self.deleted_flags = deleted_flags or ('is_deleted',)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            **dict.fromkeys(self.deleted_flags, False)
+        )
+
+
+class ApiUserManager(UserManager.from_queryset(SearchQuerySet)):
+    pass
+
+
+class AliveApiUserManager(ApiUserManager):
+    use_in_migrations = False
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
@@ -0,0 +1,59 @@
+# Generated by Django 3.2 on 2026-10-18 02:58
+
+from django.db import migrations
+import reviews.fields
+import reviews.models
+from reviews.search import normalize_search_text
+
+
+def fill_search_fields(apps, schema_editor):
+    for model_name, source in (
+        ('ApiUser', 'username'),
+        ('Category', 'name'),
+        ('Genre', 'name'),
+        ('Title', 'name'),
+    ):
+        model = apps.get_model('reviews', model_name)
+        objs = list(model.objects.only('id', source))
+        for obj in objs:
+            setattr(
+                obj, f'{source}_search', normalize_search_text(getattr(obj, source))
+            )
+        model.objects.bulk_update(objs, (f'{source}_search',), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_score_counts'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='apiuser',
+            managers=[
+                ('objects', reviews.models.ApiUserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='apiuser',
+            name='username_search',
+            field=reviews.fields.SearchField(db_index=True, default='', editable=False, max_length=150, source='username', verbose_name='Логин для поиска'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='name_search',
+            field=reviews.fields.SearchField(db_index=True, default='', editable=False, max_length=256, source='name', verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_search',
+            field=reviews.fields.SearchField(db_index=True, default='', editable=False, max_length=256, source='name', verbose_name='Название для поиска'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_search',
+            field=reviews.fields.SearchField(db_index=True, default='', editable=False, max_length=256, source='name', verbose_name='Название для поиска'),
+        ),
+        migrations.RunPython(fill_search_fields, migrations.RunPython.noop),
+    ]
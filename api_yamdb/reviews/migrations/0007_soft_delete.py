@@ -0,0 +1,60 @@
+# Generated by Django 3.2 on 2026-10-18 03:10
+
+from django.db import migrations, models
+import django.db.models.manager
+import reviews.managers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_fields'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='apiuser',
+            options={'default_manager_name': 'all_objects', 'ordering': ('username',), 'verbose_name': 'пользователь', 'verbose_name_plural': 'Пользователи'},
+        ),
+        migrations.AlterModelOptions(
+            name='category',
+            options={'default_manager_name': 'all_objects', 'ordering': ('name',), 'verbose_name': 'Категория', 'verbose_name_plural': 'Категории'},
+        ),
+        migrations.AlterModelOptions(
+            name='title',
+            options={'default_manager_name': 'all_objects', 'verbose_name': 'Произведение', 'verbose_name_plural': 'Произведения'},
+        ),
+        migrations.AlterModelManagers(
+            name='apiuser',
+            managers=[
+                ('all_objects', reviews.managers.ApiUserManager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name='category',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name='title',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='apiuser',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Помечен на удаление'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Помечен на удаление'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='is_deleted',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Помечен на удаление'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 03:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportedFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150, unique=True, verbose_name='Файл')),
+                ('checksum', models.CharField(max_length=40, verbose_name='Контрольная сумма')),
+                ('batch_size', models.PositiveIntegerField(verbose_name='Размер порции')),
+                ('imported_at', models.DateTimeField(auto_now=True, verbose_name='Дата загрузки')),
+            ],
+            options={
+                'verbose_name': 'загруженный файл',
+                'verbose_name_plural': 'Загруженные файлы',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportedChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер порции')),
+                ('checksum', models.CharField(max_length=40, verbose_name='Контрольная сумма')),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='reviews.importedfile', verbose_name='Файл')),
+            ],
+            options={
+                'verbose_name': 'загруженная порция',
+                'verbose_name_plural': 'Загруженные порции',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importedchunk',
+            constraint=models.UniqueConstraint(fields=('file', 'number'), name='one_checksum_per_file_chunk'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from .constants import (LENGTH_FOR_FIELD,
                         LENGTH_FOR_FIELD_EMAIL,
@@ -10,15 +10,63 @@ from .constants import (LENGTH_FOR_FIELD,
                         SLICE,
                         MAX_SCORE_VALUE,
                         MIN_SCORE_VALUE)
+from .fields import (SearchField,
+                     SearchFieldsMixin,
+                     SearchQuerySet,
+                     TrackedQuerySet)
+from .managers import AliveApiUserManager, AliveManager, ApiUserManager
 from .validators import check_username, year_validator
 
 
-class NameSlugModel(models.Model):
+class SoftDeleteModel(models.Model):
+    is_deleted = models.BooleanField(
+        'Помечен на удаление', default=False, db_index=True, editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+
+class ChangeLoggedModel(models.Model):
+    """Сохраняет объект в транзакции вместе с обработчиками post_save.
+
+    Так запись журнала изменений фиксируется только вместе с изменением.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class UpdatedAtModel(ChangeLoggedModel):
+    updated_at = models.DateTimeField(
+        'Дата изменения', auto_now=True, db_index=True
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'updated_at'}
+        super().save(*args, **kwargs)
+
+
+class NameSlugModel(SearchFieldsMixin, UpdatedAtModel):
     name = models.CharField(max_length=LENGTH_FOR_FIELD_NAME,
                             verbose_name='Название')
+    name_search = SearchField(source='name',
+                              max_length=LENGTH_FOR_FIELD_NAME,
+                              verbose_name='Название для поиска')
     slug = models.SlugField(unique=True, max_length=LENGTH_FOR_FIELD_SLUG,
                             verbose_name='Слаг')
 
+    objects = SearchQuerySet.as_manager()
+
     class Meta:
         abstract = True
         ordering = ('name',)
@@ -27,8 +75,13 @@ class NameSlugModel(models.Model):
         return self.slug[:SLICE]
 
 
-class Title(models.Model):
+class Title(SearchFieldsMixin, UpdatedAtModel, SoftDeleteModel):
     name = models.CharField(max_length=LENGTH_FOR_FIELD_NAME)
+    name_search = SearchField(
+        source='name',
+        max_length=LENGTH_FOR_FIELD_NAME,
+        verbose_name='Название для поиска'
+    )
     author = models.ForeignKey(
         'ApiUser',
         on_delete=models.SET_NULL,
@@ -53,14 +106,65 @@ class Title(models.Model):
         related_name='titles',
         verbose_name='Категория'
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок', default=0, editable=False
+    )
+
+    all_objects = SearchQuerySet.as_manager()
+    objects = AliveManager('is_deleted', 'category__is_deleted')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        default_manager_name = 'all_objects'
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+        )
 
     def __str__(self):
         return self.name[:SLICE]
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def get_score_histogram(self):
+        histogram = dict.fromkeys(
+            range(MIN_SCORE_VALUE, MAX_SCORE_VALUE + 1), 0
+        )
+        for counter in self.score_counts.all():
+            histogram[counter.score] = counter.count
+        return histogram
+
+
+class TitleScoreCount(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    class Meta:
+        verbose_name = 'счётчик оценок'
+        verbose_name_plural = 'Счётчики оценок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='one_counter_per_title_score'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score}'
+
 
 class Genre(NameSlugModel):
 
@@ -70,15 +174,22 @@ class Genre(NameSlugModel):
         ordering = ('name',)
 
 
-class Category(NameSlugModel):
+class Category(NameSlugModel, SoftDeleteModel):
+
+    all_objects = SearchQuerySet.as_manager()
+    objects = AliveManager()
 
     class Meta(NameSlugModel.Meta):
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
         ordering = ('name',)
+        default_manager_name = 'all_objects'
 
 
-class ApiUser(AbstractUser):
+class ApiUser(SearchFieldsMixin,
+              SoftDeleteModel,
+              ChangeLoggedModel,
+              AbstractUser):
 
     class UserRoles(models.TextChoices):
         USER = 'user', 'Пользователь'
@@ -92,6 +203,9 @@ class ApiUser(AbstractUser):
         'Логин', max_length=LENGTH_FOR_FIELD, unique=True,
         validators=(check_username,)
     )
+    username_search = SearchField(
+        'Логин для поиска', source='username', max_length=LENGTH_FOR_FIELD
+    )
     first_name = models.CharField(
         'Имя', max_length=LENGTH_FOR_FIELD, null=True, blank=True
     )
@@ -111,10 +225,14 @@ class ApiUser(AbstractUser):
         'Информация', null=True, blank=True
     )
 
+    all_objects = ApiUserManager()
+    objects = AliveApiUserManager()
+
     class Meta():
         verbose_name = 'пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ('username',)
+        default_manager_name = 'all_objects'
 
     @property
     def is_admin(self):
@@ -128,7 +246,7 @@ class ApiUser(AbstractUser):
         return self.username[:SLICE]
 
 
-class TextAuthorPubDateBaseModel(models.Model):
+class TextAuthorPubDateBaseModel(UpdatedAtModel):
     text = models.TextField('Текст отзыва')
     author = models.ForeignKey(
         ApiUser,
@@ -137,9 +255,13 @@ class TextAuthorPubDateBaseModel(models.Model):
     )
     pub_date = models.DateTimeField('Дата создания', auto_now_add=True)
 
+    all_objects = TrackedQuerySet.as_manager()
+    objects = AliveManager('author__is_deleted')
+
     class Meta:
         ordering = ('-pub_date',)
         abstract = True
+        default_manager_name = 'all_objects'
 
     def __str__(self):
         return self.text[:SLICE]
@@ -175,6 +297,19 @@ class Review(TextAuthorPubDateBaseModel):
                 name='only_one_review_to_title_from_user'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'title_id', 'score'} <= instance.__dict__.keys():
+            instance._saved_rating = (instance.title_id, instance.score)
+        return instance
 
 
 class Comment(TextAuthorPubDateBaseModel):
@@ -184,7 +319,91 @@ class Comment(TextAuthorPubDateBaseModel):
         verbose_name='Отзыв'
     )
 
+    objects = AliveManager('author__is_deleted', 'review__author__is_deleted')
+
     class Meta(TextAuthorPubDateBaseModel.Meta):
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
+
+
+class Change(models.Model):
+
+    class Models(models.TextChoices):
+        TITLE = 'title', 'Произведение'
+        GENRE = 'genre', 'Жанр'
+        CATEGORY = 'category', 'Категория'
+        REVIEW = 'review', 'Отзыв'
+        COMMENT = 'comment', 'Комментарий'
+        USER = 'user', 'Пользователь'
+
+    class Actions(models.TextChoices):
+        CREATE = 'create', 'Создание'
+        UPDATE = 'update', 'Изменение'
+        DELETE = 'delete', 'Удаление'
+
+    model = models.CharField(
+        'Модель',
+        max_length=max(len(model) for model, _ in Models.choices),
+        choices=Models.choices
+    )
+    object_id = models.PositiveBigIntegerField('ID объекта')
+    action = models.CharField(
+        'Действие',
+        max_length=max(len(action) for action, _ in Actions.choices),
+        choices=Actions.choices
+    )
+    created_at = models.DateTimeField('Дата изменения', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.action} {self.model}:{self.object_id}'
+
+
+class ImportedFile(models.Model):
+    name = models.CharField('Файл', max_length=LENGTH_FOR_FIELD, unique=True)
+    checksum = models.CharField('Контрольная сумма', max_length=40)
+    batch_size = models.PositiveIntegerField('Размер порции')
+    imported_at = models.DateTimeField('Дата загрузки', auto_now=True)
+
+    class Meta:
+        verbose_name = 'загруженный файл'
+        verbose_name_plural = 'Загруженные файлы'
+        ordering = ('name',)
+
+    def __str__(self):
+        return self.name[:SLICE]
+
+
+class ImportedChunk(models.Model):
+    file = models.ForeignKey(
+        ImportedFile,
+        on_delete=models.CASCADE,
+        related_name='chunks',
+        verbose_name='Файл'
+    )
+    number = models.PositiveIntegerField('Номер порции')
+    checksum = models.CharField('Контрольная сумма', max_length=40)
+
+    class Meta:
+        verbose_name = 'загруженная порция'
+        verbose_name_plural = 'Загруженные порции'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('file', 'number'),
+                name='one_checksum_per_file_chunk'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.file_id}: {self.number}'
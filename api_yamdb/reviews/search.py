@@ -0,0 +1,129 @@
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+TITLE_FTS_TABLE = 'reviews_title_fts'
+"""Виртуальная таблица FTS5 с названиями и описаниями произведений."""
+
+TITLE_FTS_SQL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_FTS_TABLE} USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_insert
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_delete
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_update
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {TITLE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+TITLE_FTS_TRIGGERS = {
+    f'{TITLE_FTS_TABLE}_{action}' for action in ('insert', 'delete', 'update')
+}
+TITLE_FTS_WEIGHTS = (10.0, 1.0)
+"""Веса колонок name и description при ранжировании bm25."""
+
+
+def install_title_fts(connection):
+    """Создаёт индекс FTS5 и триггеры синхронизации, если их нет.
+
+    Пересборка таблицы в миграциях SQLite удаляет триггеры, поэтому
+    функция вызывается после каждого migrate и при отсутствии триггеров
+    перестраивает индекс по текущим данным.
+    """
+
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'reviews_title'"
+        )
+        if TITLE_FTS_TRIGGERS <= {row[0] for row in cursor.fetchall()}:
+            return
+        for sql in TITLE_FTS_SQL:
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}) "
+            "VALUES ('rebuild')"
+        )
+
+
+def install_search_index(sender, using, **kwargs):
+    install_title_fts(connections[using])
+
+
+def has_title_fts(connection):
+    return (
+        connection.vendor == 'sqlite'
+        and TITLE_FTS_TABLE in connection.introspection.table_names()
+    )
+
+
+def normalize_search_text(text):
+    """Приводит текст к виду для поиска: casefold и замена «ё» на «е»."""
+
+    if text is None:
+        return ''
+    return str(text).casefold().replace('ё', 'е')
+
+
+def prefix_range(prefix):
+    """Возвращает границы [начало, конец) строк с заданным префиксом.
+
+    В отличие от LIKE, сравнение по диапазону использует обычный индекс.
+    """
+
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def build_match_query(text):
+    """Превращает пользовательский ввод в запрос FTS5 из префиксов слов."""
+
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""')) for word in text.split()
+    )
+
+
+def search_titles(queryset, text):
+    """Фильтрует произведения по тексту и сортирует их по bm25.
+
+    Отбор идёт через подзапрос pk__in, чтобы выборку можно было вкладывать
+    в другие запросы: Django не переименовывает таблицы в SQL из extra().
+    Для СУБД без FTS5 используется поиск подстроки без ранжирования.
+    """
+
+    match = build_match_query(text)
+    if not match:
+        return queryset
+    if not has_title_fts(connections[queryset.db]):
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text)
+        )
+    weights = ', '.join(str(weight) for weight in TITLE_FTS_WEIGHTS)
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {TITLE_FTS_TABLE} '
+        f'WHERE {TITLE_FTS_TABLE} MATCH %s',
+        (match,)
+    )).extra(
+        select={'search_rank': (
+            f'SELECT bm25({TITLE_FTS_TABLE}, {weights}) '
+            f'FROM {TITLE_FTS_TABLE} WHERE {TITLE_FTS_TABLE} MATCH %s '
+            f'AND rowid = {queryset.model._meta.db_table}.id'
+        )},
+        select_params=(match,),
+    ).order_by('search_rank', 'pk')
@@ -0,0 +1,136 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import (m2m_changed,
+                                      post_delete,
+                                      post_save,
+                                      pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .models import (ApiUser,
+                     Category,
+                     Comment,
+                     Genre,
+                     Review,
+                     Title,
+                     TitleScoreCount)
+
+
+def change_title_score(title_id, score, delta):
+    """Атомарно добавляет (delta=1) или убирает (delta=-1) оценку
+    из хранимых счётчиков рейтинга и гистограммы произведения."""
+
+    Title.all_objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score * delta,
+        rating_count=F('rating_count') + delta
+    )
+    counters = TitleScoreCount.objects.filter(title_id=title_id, score=score)
+    if counters.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            TitleScoreCount.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        counters.update(count=F('count') + delta)
+
+
+@receiver(pre_save, sender=Review)
+def load_saved_rating(sender, instance, **kwargs):
+    if not hasattr(instance, '_saved_rating') and instance.pk:
+        instance._saved_rating = Review.all_objects.filter(
+            pk=instance.pk
+        ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, created, **kwargs):
+    saved_rating = getattr(instance, '_saved_rating', None)
+    current_rating = (instance.title_id, instance.score)
+    if created or saved_rating is None:
+        change_title_score(*current_rating, 1)
+    elif saved_rating != current_rating:
+        change_title_score(*saved_rating, -1)
+        change_title_score(*current_rating, 1)
+    instance._saved_rating = current_rating
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    if ApiUser.all_objects.filter(
+        pk=instance.author_id, is_deleted=True
+    ).exists():
+        # Оценки удалённого пользователя убраны из рейтинга при пометке.
+        return
+    saved_rating = getattr(
+        instance, '_saved_rating', None
+    ) or (instance.title_id, instance.score)
+    change_title_score(*saved_rating, -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        titles = Title.all_objects.filter(pk=instance.pk)
+    elif pk_set is None:
+        titles = Title.all_objects.filter(genre=instance)
+    else:
+        titles = Title.all_objects.filter(pk__in=pk_set)
+    titles.update()
+
+
+@receiver(pre_save, sender=Genre)
+@receiver(pre_save, sender=Category)
+def load_saved_name(sender, instance, **kwargs):
+    instance._saved_name = instance.pk and sender._base_manager.filter(
+        pk=instance.pk
+    ).values_list('name', 'slug').first()
+
+
+def is_renamed(instance):
+    return instance._saved_name not in (
+        None, (instance.name, instance.slug)
+    )
+
+
+@receiver(post_save, sender=Genre)
+def touch_renamed_genre_titles(sender, instance, created, **kwargs):
+    if not created and is_renamed(instance):
+        Title.all_objects.filter(genre=instance).update()
+
+
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    Title.all_objects.filter(genre=instance).update()
+
+
+@receiver(post_save, sender=Category)
+def touch_category_titles(sender, instance, created, **kwargs):
+    """Отмечает изменёнными произведения переименованной категории.
+
+    Пометка на удаление не трогает произведения: их удаление журнал
+    получает от log_save.
+    """
+
+    if not created and is_renamed(instance):
+        Title.all_objects.filter(category=instance).update()
+
+
+@receiver(pre_save, sender=ApiUser)
+def load_saved_username(sender, instance, **kwargs):
+    instance._saved_username = instance.pk and ApiUser.all_objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=ApiUser)
+def touch_author_texts(sender, instance, created, **kwargs):
+    """Отмечает изменёнными отзывы и комментарии переименованного автора."""
+
+    if created or instance._saved_username in (None, instance.username):
+        return
+    Review.all_objects.filter(author=instance).update()
+    Comment.all_objects.filter(author=instance).update()
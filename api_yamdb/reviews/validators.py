@@ -17,8 +17,14 @@ def check_username(username):
     return username
 
 
+def get_max_year():
+    """Возвращает наибольший допустимый год произведения."""
+
+    return datetime.datetime.now().year
+
+
 def year_validator(value):
-    if value > datetime.datetime.now().year:
+    if value > get_max_year():
         raise ValidationError(
             f'Invalid year: {value}'
         )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title, TitleScoreCount
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client, admin,
+                                              user, moderator):
+        authors_map = {admin: admin_client, moderator: moderator_client}
+        reviews, titles = create_reviews(admin_client, authors_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения рассчитывается по '
+            'хранимым счётчикам оценок.'
+        )
+
+        create_single_review(user_client, title_id, 'text', 8)
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что создание отзыва обновляет рейтинг произведения.'
+        )
+
+        response = admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что изменение оценки в отзыве обновляет рейтинг '
+            'произведения.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что удаление отзыва обновляет рейтинг произведения.'
+        )
+
+        user.delete()
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что каскадное удаление отзывов вместе с '
+            'пользователем обновляет рейтинг произведения.'
+        )
+
+        moderator.delete()
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_recount_ratings_command(self, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=100, rating_count=3
+        )
+        TitleScoreCount.objects.filter(title_id=title_id).delete()
+
+        call_command('recount_ratings', '--check')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (100, 3), (
+            'Проверьте, что команда `recount_ratings --check` не изменяет '
+            'счётчики.'
+        )
+
+        call_command('recount_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (5, 1), (
+            'Проверьте, что команда `recount_ratings` восстанавливает '
+            'счётчики рейтинга.'
+        )
+        assert Title.objects.get(pk=title_id).get_score_histogram()[5] == 1, (
+            'Проверьте, что команда `recount_ratings` восстанавливает '
+            'гистограмму оценок.'
+        )
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+def create_catalogue(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+    return genres, category
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_list_queries_do_not_grow_with_page_size(self, client):
+        create_catalogue(10)
+        small_page = count_queries(client, f'{self.TITLES_URL}?limit=2')
+        large_page = count_queries(client, f'{self.TITLES_URL}?limit=10')
+        assert small_page == large_page, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от размера страницы.'
+        )
+
+    def test_02_write_response_queries_are_fixed(self, admin_client):
+        genres, category = create_catalogue(2)
+        first, second = Title.objects.order_by('id')
+        first.genre.set(genres[:1])
+        url = f'{self.TITLES_URL}{{title_id}}/'
+        with CaptureQueriesContext(connection) as one_genre:
+            response = admin_client.patch(
+                url.format(title_id=first.id), data={'year': 1999}
+            )
+        assert response.status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as many_genres:
+            response = admin_client.patch(
+                url.format(title_id=second.id), data={'year': 1999}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['genre']) == len(genres)
+        assert len(one_genre) == len(many_genres), (
+            f'Проверьте, что ответ на PATCH-запрос к `{self.TITLES_URL}'
+            '{title_id}/` не выполняет отдельных запросов для каждого жанра.'
+        )
+
+    def test_03_genre_slugs_resolved_in_one_query(self, admin_client):
+        genres, category = create_catalogue(0)
+        data = {'name': 'Терминатор', 'year': 1984, 'category': category.slug}
+        with CaptureQueriesContext(connection) as one_genre:
+            response = admin_client.post(
+                self.TITLES_URL, data={**data, 'genre': [genres[0].slug]}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        with CaptureQueriesContext(connection) as many_genres:
+            response = admin_client.post(
+                self.TITLES_URL,
+                data={**data, 'genre': [genre.slug for genre in genres]}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(one_genre) == len(many_genres), (
+            f'Проверьте, что при POST-запросе к `{self.TITLES_URL}` все '
+            'слаги жанров находятся одним запросом.'
+        )
+
+        response = admin_client.post(
+            self.TITLES_URL,
+            data={**data, 'genre': [genres[0].slug, 'unknown', 'missing']}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert len(response.json()['genre']) == 2, (
+            'Проверьте, что ответ содержит ошибку для каждого '
+            'несуществующего слага жанра.'
+        )
@@ -0,0 +1,198 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def create_titles(size):
+    categories = [
+        Category.objects.create(name=f'Категория {idx}', slug=f'cat-{idx}')
+        for idx in range(2)
+    ]
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    for idx in range(size):
+        title = Title.objects.create(
+            name=f'Произведение {idx % 3}',
+            year=1990 + idx % 4,
+            category=categories[idx % 2]
+        )
+        title.genre.add(genre)
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(
+        json.dumps({'p': position}).encode()
+    ).decode()
+
+
+def walk(client, url):
+    ids = []
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсоров не выполняется подсчёт '
+            'количества объектов.'
+        )
+        ids.extend(title['id'] for title in data['results'])
+        pages.append(data)
+        url = data['next']
+    return ids, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleCursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('ordering,expected_order', (
+        ('', ('name', 'id')),
+        ('-year', ('-year', '-id')),
+        ('category', ('category__name', 'id')),
+    ))
+    def test_01_cursor_pages_cover_all_titles(self, client, ordering,
+                                              expected_order):
+        create_titles(11)
+        expected = list(
+            Title.objects.order_by(*expected_order).values_list(
+                'id', flat=True
+            )
+        )
+        ids, pages = walk(
+            client,
+            f'{self.TITLES_URL}?pagination=cursor&limit=4&ordering={ordering}'
+        )
+        assert ids == expected, (
+            'Проверьте, что при пагинации по курсору страницы '
+            f'`{self.TITLES_URL}` содержат все произведения в порядке '
+            'сортировки без пропусков и повторов.'
+        )
+        assert len(pages) == 3
+        response = client.get(pages[-1]['previous'])
+        assert [
+            title['id'] for title in response.json()['results']
+        ] == [title['id'] for title in pages[1]['results']], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу.'
+        )
+
+    @pytest.mark.parametrize('ordering', ('category', '-category', 'year'))
+    def test_02_cursor_and_offset_orderings_match(self, client, ordering):
+        create_titles(11)
+        Category.objects.filter(slug='cat-0').update(name='Я категория')
+        _, pages = walk(
+            client,
+            f'{self.TITLES_URL}?pagination=cursor&limit=4&ordering={ordering}'
+        )
+        offset = client.get(
+            f'{self.TITLES_URL}?limit=100&ordering={ordering}'
+        ).json()['results']
+        key = ordering.lstrip('-')
+        assert [
+            title[key] for page in pages for title in page['results']
+        ] == [title[key] for title in offset], (
+            'Проверьте, что сортировка `ordering` в режиме курсоров '
+            'совпадает с сортировкой в режиме limit/offset.'
+        )
+
+    def test_03_offset_pagination_is_default(self, client):
+        create_titles(3)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 3, (
+            f'Проверьте, что по умолчанию `{self.TITLES_URL}` использует '
+            'пагинацию limit/offset.'
+        )
+
+    def test_04_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        create_titles(1)
+        for position in (['abc', 1], [[1990], 1], [None, 1], [1990, 'x']):
+            response = client.get(
+                f'{self.TITLES_URL}?ordering=year'
+                f'&cursor={encode_cursor(position)}'
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор со значением неподходящего типа '
+                'возвращает ответ со статусом 404.'
+            )
+
+    @pytest.mark.parametrize('params', (
+        'ordering=genre', 'ordering=-genre', 'q=Произведение',
+    ))
+    def test_05_unsupported_cursor_params(self, client, params):
+        create_titles(3)
+        response = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&{params}'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что в режиме курсоров сортировка по жанру и '
+            'полнотекстовый поиск отклоняются, а не заменяются сортировкой '
+            'по названию.'
+        )
+        assert client.get(
+            f'{self.TITLES_URL}?{params}'
+        ).status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10PubDateCursorPagination:
+
+    def test_01_reviews_and_comments_cursor_pages(self, client, admin,
+                                                  django_user_model):
+        create_titles(1)
+        title = Title.objects.get()
+        authors = [admin] + [
+            django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(6)
+        ]
+        for author in authors:
+            review = Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+            Comment.objects.create(review=review, author=admin, text='text')
+        review = Review.objects.order_by('id').first()
+        for _ in range(4):
+            Comment.objects.create(review=review, author=admin, text='text')
+
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        ids, _ = walk(client, f'{reviews_url}?pagination=cursor&limit=3')
+        assert ids == list(
+            title.reviews.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        ), (
+            'Проверьте, что пагинация по курсору для `/api/v1/titles/'
+            '{title_id}/reviews/` возвращает отзывы по убыванию `pub_date`.'
+        )
+
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        ids, _ = walk(
+            client,
+            f'{comments_url}?pagination=cursor&limit=2&ordering=pub_date'
+        )
+        assert ids == list(
+            review.comments.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        ), (
+            'Проверьте, что пагинация по курсору для `/api/v1/titles/'
+            '{title_id}/reviews/{review_id}/comments/` поддерживает '
+            'сортировку по `pub_date`.'
+        )
+
+        for url in (reviews_url, comments_url):
+            for position in (['garbage', 1], [{'a': 1}, 1]):
+                response = client.get(
+                    f'{url}?cursor={encode_cursor(position)}'
+                )
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что для `{url}` курсор с некорректной '
+                    'датой возвращает ответ со статусом 404.'
+                )
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_repeated_reads_are_served_from_cache(self, admin_client,
+                                                     client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        for url in (self.TITLES_URL, detail_url):
+            first = client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                second = client.get(url)
+            assert second.status_code == HTTPStatus.OK
+            assert second.json() == first.json()
+            assert not context.captured_queries, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'обслуживается из кэша.'
+            )
+
+    def test_02_writes_invalidate_cache(self, admin_client, user_client,
+                                        client):
+        titles, _, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        detail_url = f'{self.TITLES_URL}{title_id}/'
+        assert client.get(detail_url).json()['rating'] is None
+
+        create_single_review(user_client, title_id, 'text', 7)
+        assert client.get(detail_url).json()['rating'] == 7, (
+            'Проверьте, что создание отзыва сбрасывает кэш произведений.'
+        )
+
+        admin_client.patch(detail_url, data={'name': 'Новое название'})
+        assert client.get(detail_url).json()['name'] == 'Новое название'
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        response = client.get(detail_url).json()
+        assert genres[0] not in response['genre'], (
+            'Проверьте, что удаление жанра сбрасывает кэш произведений.'
+        )
+
+        assert client.get(self.TITLES_URL).json()['count'] == 2
+        Title.objects.get(pk=title_id).delete()
+        assert client.get(self.TITLES_URL).json()['count'] == 1, (
+            'Проверьте, что удаление произведения сбрасывает кэш.'
+        )
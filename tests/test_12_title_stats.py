@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review, TitleScoreCount
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+
+    def test_01_stats(self, admin_client, client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.STATS_URL_TEMPLATE.format(title_id=title_id)
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что эндпоинт `/api/v1/titles/{title_id}/stats/` '
+            'доступен без токена.'
+        )
+        data = response.json()
+        assert data['count'] == 0
+        assert data['mean'] is None and data['median'] is None
+        assert set(data['histogram'].values()) == {0}
+        assert len(data['histogram']) == 10
+
+        scores = (3, 8, 8, 10)
+        for idx, score in enumerate(scores):
+            user = django_user_model.objects.create_user(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+            admin_client.force_authenticate(user)
+            create_single_review(admin_client, title_id, 'text', score)
+        admin_client.force_authenticate(None)
+
+        data = client.get(url).json()
+        assert data['count'] == 4
+        assert data['mean'] == 7.25
+        assert data['median'] == 8
+        assert data['histogram']['8'] == 2, (
+            'Проверьте, что гистограмма оценок содержит количество отзывов '
+            'для каждой оценки.'
+        )
+
+        review = Review.objects.get(title_id=title_id, score=3)
+        review.score = 10
+        review.save()
+        Review.objects.get(
+            title_id=title_id, score=8, author__username='user1'
+        ).delete()
+        data = client.get(url).json()
+        assert data['histogram']['3'] == 0
+        assert data['histogram']['8'] == 1
+        assert data['histogram']['10'] == 2
+        assert data['median'] == 10
+        assert TitleScoreCount.objects.filter(title_id=title_id).count() <= 3
+
+    def test_02_stats_not_found(self, client):
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=999))
+        assert response.status_code == HTTPStatus.NOT_FOUND
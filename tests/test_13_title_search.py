@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'q': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_fulltext_search(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        for name, description in (
+            ('Война и мир', 'Роман-эпопея'),
+            ('Мирный воин', 'Фильм о гимнасте'),
+            ('Старик и море', 'Повесть о мире и рыбаке'),
+        ):
+            Title.objects.create(
+                name=name, description=description, year=1900,
+                category=category
+            )
+
+        assert self.search(client, 'ВОЙНА') == ['Война и мир'], (
+            'Проверьте, что параметр `q` ищет по названию произведения без '
+            'учёта регистра, в том числе для кириллицы.'
+        )
+        assert self.search(client, 'мир') == [
+            'Война и мир', 'Мирный воин', 'Старик и море'
+        ], (
+            'Проверьте, что результаты поиска ранжируются: совпадения в '
+            'названии выше совпадений в описании.'
+        )
+
+        title = Title.objects.get(name='Мирный воин')
+        title.name = 'Путь воина'
+        title.save()
+        Title.objects.filter(name='Война и мир').delete()
+        assert self.search(client, 'мир') == ['Старик и море'], (
+            'Проверьте, что поисковый индекс обновляется при изменении и '
+            'удалении произведений.'
+        )
+        assert self.search(client, 'гимна') == ['Путь воина']
+        assert self.search(client, '"') == []
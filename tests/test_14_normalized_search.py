@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14NormalizedSearch:
+
+    def test_01_title_name_filter_folds_cyrillic(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.create(name='Ёжик в тумане', year=1975,
+                             category=category)
+        Title.objects.create(name='Ежевика', year=1990, category=category)
+        Title.objects.create(name='Туман', year=1990, category=category)
+
+        for query, expected in (
+            ('ЁЖИК', ['Ёжик в тумане']),
+            ('еж', ['Ёжик в тумане', 'Ежевика']),
+            ('ёжик в т', ['Ёжик в тумане']),
+        ):
+            response = client.get('/api/v1/titles/', {'name': query})
+            assert response.status_code == HTTPStatus.OK
+            assert sorted(
+                title['name'] for title in response.json()['results']
+            ) == expected, (
+                'Проверьте, что фильтр `name` для `/api/v1/titles/` ищет по '
+                'префиксу названия без учёта регистра кириллицы и '
+                'различия «е»/«ё».'
+            )
+
+    def test_02_genre_search_and_bulk_paths(self, client):
+        Genre.objects.bulk_create((
+            Genre(name='Ужасы', slug='horror'),
+            Genre(name='Детектив', slug='detective'),
+        ))
+        response = client.get('/api/v1/genres/', {'search': 'УЖА'})
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'horror'
+        ], (
+            'Проверьте, что поиск по `/api/v1/genres/` учитывает объекты, '
+            'созданные через bulk_create.'
+        )
+
+        Genre.objects.filter(slug='horror').update(name='Ёлки')
+        genre = Genre.objects.get(slug='detective')
+        genre.name = 'Ёжики'
+        genre.save(update_fields=('name',))
+        response = client.get('/api/v1/genres/', {'search': 'е'})
+        assert sorted(
+            genre['slug'] for genre in response.json()['results']
+        ) == ['detective', 'horror'], (
+            'Проверьте, что нормализованное поле обновляется при update() '
+            'и save(update_fields=...).'
+        )
+
+    def test_03_user_search(self, admin_client, admin, django_user_model):
+        django_user_model.objects.create_user(
+            username='Фёдор', email='fedor@yamdb.fake'
+        )
+        response = admin_client.get('/api/v1/users/', {'search': 'федо'})
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            user['username'] for user in response.json()['results']
+        ] == ['Фёдор'], (
+            'Проверьте, что поиск пользователей по `username` не зависит от '
+            'регистра и различия «е»/«ё».'
+        )
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFacets:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_facets(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(
+            self.TITLES_URL, {'facets': 'genre,category,year', 'limit': 1}
+        )
+        assert response.status_code == HTTPStatus.OK
+        facets = response.json()['facets']
+        assert facets['genre'] == [
+            {'slug': 'drama', 'name': 'Драма', 'count': 1},
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+            {'slug': 'horror', 'name': 'Ужасы', 'count': 1},
+        ], (
+            'Проверьте, что фасет `genre` содержит количество произведений '
+            'для каждого жанра по всей выборке, а не только по странице.'
+        )
+        assert facets['category'] == [
+            {'slug': 'books', 'name': 'Книги', 'count': 1},
+            {'slug': 'films', 'name': 'Фильм', 'count': 1},
+        ]
+        assert facets['year'] == [{'decade': 1980, 'count': 2}]
+
+        response = client.get(
+            self.TITLES_URL, {'facets': 'genre', 'category': 'films'}
+        )
+        facets = response.json()['facets']
+        assert [row['slug'] for row in facets['genre']] == [
+            'comedy', 'horror'
+        ], (
+            'Проверьте, что фасеты считаются с учётом фильтров запроса.'
+        )
+
+        response = client.get(
+            self.TITLES_URL, {'facets': 'category', 'q': 'back'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что фасеты можно запрашивать вместе с полнотекстовым '
+            'поиском.'
+        )
+        assert response.json()['facets']['category'] == [
+            {'slug': 'films', 'name': 'Фильм', 'count': 1},
+        ]
+
+    def test_02_unknown_facet(self, client):
+        response = client.get(self.TITLES_URL, {'facets': 'author'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
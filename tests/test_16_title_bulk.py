@@ -0,0 +1,168 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleBulkCreate:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def get_items(self, admin_client, size):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 1990 + idx,
+                'genre': [genre['slug'] for genre in genres[:idx % 3 + 1]],
+                'category': categories[idx % 2]['slug'],
+                'description': 'Описание',
+            }
+            for idx in range(size)
+        ]
+
+    def test_01_bulk_create_json(self, admin_client, client):
+        items = self.get_items(admin_client, 5)
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'со списком корректных произведений возвращает статус 201.'
+        )
+        ids = response.json()['ids']
+        assert len(ids) == 5
+        for title_id, item in zip(ids, items):
+            data = client.get(f'/api/v1/titles/{title_id}/').json()
+            assert data['name'] == item['name']
+            assert sorted(genre['slug'] for genre in data['genre']) == sorted(
+                item['genre']
+            ), (
+                'Проверьте, что массовое создание произведений сохраняет '
+                'связи с жанрами.'
+            )
+        assert client.get('/api/v1/titles/').json()['count'] == 5
+
+    def test_02_bulk_create_ndjson(self, admin_client):
+        items = self.get_items(admin_client, 3)
+        response = admin_client.generic(
+            'POST', self.BULK_URL,
+            '\n'.join(json.dumps(item) for item in items),
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Title.objects.count() == 3
+
+    def test_03_bulk_create_errors(self, admin_client):
+        items = self.get_items(admin_client, 3)
+        items[1]['genre'] = ['unknown']
+        items[2]['year'] = 'дветыщи'
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()['errors']
+        assert [error['index'] for error in errors] == [1, 2], (
+            'Проверьте, что ответ содержит ошибки для каждого '
+            'некорректного объекта.'
+        )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибках ни одно произведение не создаётся.'
+        )
+
+    def test_04_bulk_create_permissions(self, admin_client, user_client,
+                                        client):
+        items = self.get_items(admin_client, 1)
+        for not_admin in (user_client, client):
+            response = not_admin.post(
+                self.BULK_URL, data=json.dumps(items),
+                content_type='application/json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleBulkUpdate:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_same_changes_for_many_titles(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        ids = [title['id'] for title in titles]
+        response = admin_client.patch(self.BULK_URL, data={
+            'ids': ids,
+            'data': {'category': categories[1]['slug'],
+                     'genre': [genres[1]['slug']]},
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что PATCH-запрос администратора к `{self.BULK_URL}` '
+            'с корректными данными возвращает статус 200.'
+        )
+        assert response.json() == {'updated': 2}
+        for title_id in ids:
+            data = client.get(f'/api/v1/titles/{title_id}/').json()
+            assert data['category']['slug'] == categories[1]['slug']
+            assert [genre['slug'] for genre in data['genre']] == [
+                genres[1]['slug']
+            ]
+
+    def test_02_per_item_changes(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(self.BULK_URL, data=[
+            {'id': titles[0]['id'], 'year': 2001, 'name': 'Ёлки'},
+            {'id': titles[1]['id'], 'year': 2002},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        first = Title.objects.get(pk=titles[0]['id'])
+        assert (first.year, first.name, first.name_search) == (
+            2001, 'Ёлки', 'елки'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).year == 2002
+        assert Title.objects.get(pk=titles[1]['id']).genre.count() == 1, (
+            'Проверьте, что жанры не меняются, если их нет в изменениях.'
+        )
+
+    def test_03_errors(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(self.BULK_URL, data=[
+            {'id': titles[0]['id'], 'year': 2001},
+            {'id': 100500, 'year': 2002},
+            {'id': titles[1]['id'], 'year': 3000},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert [
+            error['index'] for error in response.json()['errors']
+        ] == [1, 2]
+        assert Title.objects.get(pk=titles[0]['id']).year == titles[0]['year'], (
+            'Проверьте, что при ошибках изменения не применяются.'
+        )
+
+    def test_04_id_types(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(self.BULK_URL, data=[
+            {'id': str(titles[0]['id']), 'year': 2001},
+            {'id': True, 'year': 2002},
+            {'id': 'abc', 'year': 2002},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()['errors']
+        assert [error['index'] for error in errors] == [1, 2], (
+            'Проверьте, что id-строка с числом принимается, а логические '
+            'и нечисловые значения id отклоняются.'
+        )
+        assert all(
+            'does not exist' not in error['errors']['id'][0]
+            for error in errors
+        ), (
+            'Проверьте, что для id неверного типа возвращается ошибка '
+            'типа, а не отсутствия объекта.'
+        )
+
+        response = admin_client.patch(self.BULK_URL, data=[
+            {'id': str(titles[0]['id']), 'year': 2001},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert Title.objects.get(pk=titles[0]['id']).year == 2001
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17MergeGenresAndCategories:
+
+    def test_01_merge_genres(self, admin_client, client):
+        titles, _, genres = create_titles(admin_client)
+        # Терминатор: horror, comedy; Крепкий орешек: drama.
+        Title.objects.get(pk=titles[1]['id']).genre.add(
+            Genre.objects.get(slug='horror')
+        )
+        response = admin_client.post(
+            '/api/v1/genres/horror/merge/', data={'target': 'comedy'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что POST-запрос администратора к '
+            '`/api/v1/genres/{slug}/merge/` возвращает статус 200.'
+        )
+        assert not Genre.objects.filter(slug='horror').exists()
+        first = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        second = client.get(f'/api/v1/titles/{titles[1]["id"]}/').json()
+        assert [genre['slug'] for genre in first['genre']] == ['comedy'], (
+            'Проверьте, что при слиянии жанров не появляются дубликаты '
+            'связей произведения с жанром.'
+        )
+        assert sorted(genre['slug'] for genre in second['genre']) == [
+            'comedy', 'drama'
+        ]
+
+    def test_02_merge_categories(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(
+            '/api/v1/categories/books/merge/', data={'target': 'films'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['moved'] == 1
+        assert not Category.objects.filter(slug='books').exists()
+        assert Title.objects.filter(category__slug='films').count() == 2, (
+            'Проверьте, что при слиянии категорий произведения переносятся '
+            'в целевую категорию, а не удаляются.'
+        )
+
+    def test_03_split_genre(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        Title.objects.get(pk=titles[1]['id']).genre.add(
+            Genre.objects.get(slug='horror')
+        )
+        response = admin_client.post(
+            '/api/v1/genres/horror/split/',
+            data={'target': 'drama', 'titles': [titles[0]['id']]},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(
+            Title.objects.filter(genre__slug='horror').values_list(
+                'id', flat=True
+            )
+        ) == {titles[1]['id']}
+        assert Title.objects.filter(genre__slug='drama').count() == 2
+
+    def test_04_merge_errors(self, admin_client, user_client):
+        create_titles(admin_client)
+        for data in ({'target': 'horror'}, {'target': 'unknown'}, {}):
+            response = admin_client.post(
+                '/api/v1/genres/horror/merge/', data=data
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            '/api/v1/genres/horror/split/', data={'target': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.post(
+            '/api/v1/genres/horror/merge/', data={'target': 'drama'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert Genre.objects.filter(slug='horror').exists()
@@ -0,0 +1,158 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.deletion import purge_deleted
+from reviews.models import (ApiUser, Category, Comment, Review, Title,
+                            TitleScoreCount)
+from tests.utils import (create_comments,
+                         create_reviews,
+                         create_single_comment,
+                         create_single_review)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18DeferredDeletion:
+
+    def test_01_category_delete_is_deferred(self, admin_client, client,
+                                            user, user_client):
+        _, _, titles = create_comments(admin_client, {user: user_client})
+        category = Title.objects.get(pk=titles[0]['id']).category
+
+        response = admin_client.delete(
+            f'/api/v1/categories/{category.slug}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что произведения удалённой категории сразу '
+            'перестают быть доступны.'
+        )
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert Review.objects.exists(), (
+            'Проверьте, что отзывы удаляются фоновой задачей, а не в '
+            'запросе на удаление категории.'
+        )
+
+        purge_deleted(chunk_size=1)
+        assert not Category.all_objects.filter(pk=category.pk).exists()
+        assert not Title.all_objects.filter(pk=titles[0]['id']).exists()
+        assert not Review.objects.exists()
+        assert not Comment.objects.exists()
+        assert not TitleScoreCount.objects.exists()
+        assert Title.objects.filter(pk=titles[1]['id']).exists()
+
+    def test_02_title_delete_is_deferred(self, admin_client, client,
+                                         user, user_client):
+        _, _, titles = create_comments(admin_client, {user: user_client})
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.delete(title_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(title_url).status_code == HTTPStatus.NOT_FOUND
+        assert client.get('/api/v1/titles/').json()['count'] == 1
+
+        call_command('purge_deleted', '--chunk-size', '1')
+        assert not Title.all_objects.filter(pk=titles[0]['id']).exists()
+        assert not Review.objects.exists()
+
+    def test_03_user_delete_is_deferred(self, admin_client, user,
+                                        user_client):
+        _, _, titles = create_comments(admin_client, {user: user_client})
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not ApiUser.objects.filter(pk=user.pk).exists()
+        assert not ApiUser.all_objects.get(pk=user.pk).is_active
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что пользователь, помеченный на удаление, не может '
+            'авторизоваться.'
+        )
+
+        purge_deleted()
+        assert not ApiUser.all_objects.filter(pk=user.pk).exists()
+        assert not Review.objects.exists()
+        assert Title.objects.get(pk=titles[0]['id']).rating is None, (
+            'Проверьте, что после удаления отзывов пользователя рейтинг '
+            'произведения пересчитан.'
+        )
+
+    def test_04_deleted_user_texts_are_hidden(self, admin_client, client,
+                                              admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        title_id, admin_review = titles[0]['id'], reviews[0]['id']
+        user_review = create_single_review(
+            user_client, title_id, 'text', 9
+        ).json()['id']
+        create_single_comment(user_client, title_id, admin_review, 'text')
+        create_single_comment(admin_client, title_id, user_review, 'text')
+        title_url = f'/api/v1/titles/{title_id}/'
+        assert client.get(title_url).json()['rating'] == 7
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        reviews_url = f'{title_url}reviews/'
+        assert [
+            review['id'] for review in client.get(reviews_url).json()[
+                'results'
+            ]
+        ] == [admin_review], (
+            'Проверьте, что отзывы пользователя, помеченного на удаление, '
+            'сразу перестают быть доступны.'
+        )
+        assert client.get(
+            f'{reviews_url}{user_review}/comments/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert not client.get(
+            f'{reviews_url}{admin_review}/comments/'
+        ).json()['results'], (
+            'Проверьте, что комментарии пользователя, помеченного на '
+            'удаление, сразу перестают быть доступны.'
+        )
+        assert client.get(title_url).json()['rating'] == 5, (
+            'Проверьте, что оценки пользователя, помеченного на удаление, '
+            'сразу убираются из рейтинга произведения.'
+        )
+
+        purge_deleted()
+        assert Title.objects.get(pk=title_id).rating == 5
+        assert not Comment.all_objects.exists()
+        output = StringIO()
+        call_command('recount_ratings', '--check', stdout=output)
+        assert 'Rating recount finished: 0 titles found' in output.getvalue()
+
+    def test_05_user_delete_cost_does_not_grow(self, admin_client,
+                                               django_user_model):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        titles = [
+            Title.objects.create(name=f'Фильм {idx}', year=2000,
+                                 category=category)
+            for idx in range(6)
+        ]
+        queries = []
+        for reviews_count in (2, 6):
+            user = django_user_model.objects.create_user(
+                username=f'author{reviews_count}',
+                email=f'author{reviews_count}@yamdb.fake'
+            )
+            for idx, title in enumerate(titles[:reviews_count]):
+                Review.objects.create(
+                    title=title, author=user, text='text',
+                    score=(3, 7)[idx % 2]
+                )
+            with CaptureQueriesContext(connection) as context:
+                admin_client.delete(f'/api/v1/users/{user.username}/')
+            queries.append(len(context.captured_queries))
+        assert queries[0] == queries[1], (
+            'Проверьте, что число запросов при удалении пользователя не '
+            'зависит от количества его отзывов.'
+        )
+        assert all(title.rating is None for title in Title.objects.all())
+        output = StringIO()
+        call_command('recount_ratings', '--check', stdout=output)
+        assert 'Rating recount finished: 0 titles found' in output.getvalue()
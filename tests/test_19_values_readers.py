@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ValuesReaders:
+
+    def get_both(self, client, monkeypatch, viewset, url):
+        fast = client.get(url)
+        assert fast.status_code == HTTPStatus.OK
+        cache.clear()
+        with monkeypatch.context() as patch:
+            patch.setattr(viewset, 'reader_class', None)
+            slow = client.get(url)
+        assert slow.status_code == HTTPStatus.OK
+        cache.clear()
+        return fast.content, slow.content
+
+    def test_01_readers_match_serializers(self, client, admin_client,
+                                          moderator_client, user_client,
+                                          admin, moderator, user,
+                                          monkeypatch):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, moderator: moderator_client}
+        )
+        create_single_review(user_client, titles[0]['id'], 'text', 8)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        for viewset, url in (
+            (TitleViewSet, '/api/v1/titles/'),
+            (TitleViewSet, f'/api/v1/titles/{title_id}/'),
+            (TitleViewSet, '/api/v1/titles/?pagination=cursor&limit=1'),
+            (TitleViewSet, '/api/v1/titles/?ordering=-genre&limit=1'),
+            (
+                TitleViewSet,
+                '/api/v1/titles/?pagination=cursor&ordering=category&limit=1'
+            ),
+            (TitleViewSet, '/api/v1/titles/?q=back'),
+            (TitleViewSet, '/api/v1/titles/?facets=genre,year'),
+            (ReviewViewSet, f'/api/v1/titles/{title_id}/reviews/'),
+            (
+                ReviewViewSet,
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/'
+            ),
+            (
+                ReviewViewSet,
+                f'/api/v1/titles/{title_id}/reviews/?pagination=cursor'
+            ),
+            (
+                CommentViewSet,
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            ),
+        ):
+            fast, slow = self.get_both(client, monkeypatch, viewset, url)
+            assert fast == slow, (
+                f'Проверьте, что быстрый путь чтения `{url}` возвращает '
+                'тот же ответ, что и сериализатор.'
+            )
+
+    def test_02_reader_queries(self, client, admin_client,
+                               django_assert_max_num_queries):
+        create_comments(admin_client, {})
+        with django_assert_max_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 2
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_fields(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                self.TITLES_URL, {'fields': 'id,name,rating'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [set(title) for title in results] == [
+            {'id', 'name', 'rating'}
+        ] * 2, (
+            'Проверьте, что параметр `fields` оставляет в ответе '
+            f'`{self.TITLES_URL}` только перечисленные поля.'
+        )
+        sql = ' '.join(query['sql'] for query in queries)
+        assert 'description' not in sql and 'reviews_genre' not in sql, (
+            'Проверьте, что поля, не указанные в `fields`, не запрашиваются '
+            'из БД.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', {'fields': 'name'}
+        )
+        assert response.json() == {'name': titles[0]['name']}
+
+    def test_02_title_expand(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        data = client.get(url, {'fields': 'genre,category', 'expand': ''})
+        assert data.json() == {
+            'genre': sorted(titles[0]['genre']),
+            'category': titles[0]['category'],
+        }, (
+            'Проверьте, что связи, не указанные в `expand`, выводятся '
+            'слагами.'
+        )
+        data = client.get(
+            url, {'fields': 'genre,category', 'expand': 'category'}
+        ).json()
+        assert data['category'] == {
+            'name': 'Фильм', 'slug': titles[0]['category']
+        }
+        assert isinstance(data['genre'][0], str)
+
+    def test_03_review_and_comment_fields(self, client, admin_client,
+                                          admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        data = client.get(
+            reviews_url, {'fields': 'id,title', 'expand': 'title'}
+        ).json()
+        assert data['results'] == [{
+            'id': reviews[0]['id'],
+            'title': {'id': titles[0]['id'], 'name': titles[0]['name']},
+        }]
+        data = client.get(
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+            {'fields': 'text,review', 'expand': 'review'}
+        ).json()
+        assert data['results'] == [{
+            'review': {'id': reviews[0]['id'], 'score': 5},
+            'text': comments[0]['text'],
+        }]
+
+    @pytest.mark.parametrize('params', (
+        {'fields': 'id,author'},
+        {'expand': 'year'},
+    ))
+    def test_04_unknown_fields(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестные поля в `fields` и `expand` '
+            'приводят к ответу со статусом 400.'
+        )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import (create_comments,
+                         create_single_comment,
+                         create_single_review)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ConditionalGet:
+
+    def test_01_title_etag(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304.'
+        )
+        assert not context.captured_queries
+        assert response['ETag'] == etag
+        assert client.get(
+            url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK
+
+        last_modified = client.get(url)['Last-Modified']
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.patch(url, data={'name': 'Новое название'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение произведения меняет его `ETag`.'
+        )
+        assert response.json()['name'] == 'Новое название'
+
+    def test_02_review_and_comment_lists(self, client, admin_client,
+                                         user_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        reviews_etag = client.get(reviews_url)['ETag']
+        comments_etag = client.get(comments_url)['ETag']
+
+        create_single_comment(user_client, title_id, review_id, 'text')
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет `ETag` списка '
+            'комментариев.'
+        )
+
+        create_single_review(user_client, title_id, 'text', 3)
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет `ETag` списка отзывов.'
+        )
+
+    def test_03_etag_changes_after_commit(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        with transaction.atomic():
+            title = Title.objects.get(pk=titles[0]['id'])
+            title.name = 'Новое название'
+            title.save()
+            assert client.get(url)['ETag'] == etag, (
+                'Проверьте, что `ETag` меняется только после фиксации '
+                'транзакции: иначе параллельный запрос получит новый '
+                '`ETag` со старыми данными.'
+            )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после фиксации транзакции `ETag` меняется.'
+        )
+        assert response.json()['name'] == 'Новое название'
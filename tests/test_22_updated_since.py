@@ -0,0 +1,128 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import ApiUser, Category, Change, Genre, Title
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22UpdatedSince:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_ids(self, client, url, since, key='id'):
+        response = client.get(url, {'updated_since': since.isoformat()})
+        assert response.status_code == HTTPStatus.OK
+        return sorted(obj[key] for obj in response.json()['results'])
+
+    def test_01_titles(self, client, admin_client, user_client):
+        _, _, titles = create_comments(admin_client, {})
+        first, second = titles[0]['id'], titles[1]['id']
+        since = timezone.now()
+        assert self.get_ids(client, self.TITLES_URL, since) == []
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{first}/', data={'year': 1985}
+        )
+        assert self.get_ids(client, self.TITLES_URL, since) == [first], (
+            'Проверьте, что `?updated_since=` возвращает только '
+            'произведения, изменённые после указанного момента.'
+        )
+
+        since = timezone.now()
+        create_single_review(user_client, second, 'text', 6)
+        assert self.get_ids(client, self.TITLES_URL, since) == [second], (
+            'Проверьте, что изменение рейтинга отмечает произведение '
+            'изменённым.'
+        )
+
+        since = timezone.now()
+        response = admin_client.patch(
+            f'{self.TITLES_URL}bulk/',
+            data=json.dumps([{'id': first, 'genre': ['drama']}]),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_ids(client, self.TITLES_URL, since) == [first], (
+            'Проверьте, что массовое изменение отмечает произведения '
+            'изменёнными.'
+        )
+
+        since = timezone.now()
+        Genre.objects.filter(slug='drama').get().delete()
+        assert self.get_ids(client, self.TITLES_URL, since) == [
+            first, second
+        ], (
+            'Проверьте, что удаление жанра отмечает его произведения '
+            'изменёнными.'
+        )
+
+    def test_02_reviews_comments_and_genres(self, client, admin_client,
+                                            admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        since = timezone.now()
+        assert self.get_ids(client, reviews_url, since) == []
+        assert self.get_ids(client, comments_url, since) == []
+
+        ApiUser.objects.filter(pk=admin.pk).get().save()
+        assert self.get_ids(client, reviews_url, since) == []
+        user = ApiUser.objects.get(pk=admin.pk)
+        user.username = 'renamed'
+        user.save()
+        assert self.get_ids(client, reviews_url, since) == [
+            reviews[0]['id']
+        ], (
+            'Проверьте, что переименование автора отмечает его отзывы '
+            'изменёнными.'
+        )
+        assert len(self.get_ids(client, comments_url, since)) == 1
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        assert self.get_ids(
+            client, '/api/v1/genres/', since, key='slug'
+        ) == ['western']
+
+    @pytest.mark.parametrize('value', ('yesterday', '2024-13-01T00:00'))
+    def test_03_invalid_value(self, client, value):
+        response = client.get(self.TITLES_URL, {'updated_since': value})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректное значение `updated_since` '
+            'приводит к ответу со статусом 400.'
+        )
+
+    def test_04_category_rename_and_delete(self, client, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        title = Title.objects.get(pk=titles[0]['id'])
+        category = title.category
+
+        since = timezone.now()
+        category.save()
+        assert self.get_ids(client, self.TITLES_URL, since) == [], (
+            'Проверьте, что сохранение категории без изменений не отмечает '
+            'её произведения изменёнными.'
+        )
+        category.name = 'Новое название'
+        category.save()
+        assert self.get_ids(client, self.TITLES_URL, since) == [title.pk], (
+            'Проверьте, что переименование категории отмечает её '
+            'произведения изменёнными.'
+        )
+
+        last_id = Change.objects.latest('id').id
+        admin_client.delete(f'/api/v1/categories/{category.slug}/')
+        assert sorted(Change.objects.filter(
+            id__gt=last_id, model=Change.Models.TITLE
+        ).values_list('object_id', 'action')) == [(title.pk, 'delete')], (
+            'Проверьте, что пометка категории на удаление записывает в '
+            'журнал только удаление её произведений.'
+        )
+        assert Category.all_objects.get(pk=category.pk).is_deleted
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from reviews.models import Change, Genre
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ChangeFeed:
+
+    CHANGES_URL = '/api/v1/changes/'
+
+    def read_all(self, client, after=0, limit=None):
+        params = {'after': after}
+        if limit:
+            params['limit'] = limit
+        events = []
+        while True:
+            response = client.get(self.CHANGES_URL, params)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            events.extend(data['results'])
+            params['after'] = data['cursor']
+            if not data['has_more']:
+                return events, data['cursor']
+
+    def test_01_feed(self, admin_client, user_client, client):
+        assert client.get(self.CHANGES_URL).status_code in (
+            HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+        )
+        assert user_client.get(
+            self.CHANGES_URL
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что журнал изменений доступен только '
+            'администратору.'
+        )
+        titles, _, _ = create_titles(admin_client)
+        events, cursor = self.read_all(admin_client, limit=2)
+        ids = [event['id'] for event in events]
+        assert ids == sorted(ids) and len(set(ids)) == len(ids), (
+            'Проверьте, что курсоры журнала изменений монотонно возрастают '
+            'и порции не пересекаются.'
+        )
+        assert {
+            (event['model'], event['object_id'])
+            for event in events if event['action'] == 'create'
+        } >= {('title', title['id']) for title in titles}
+        assert {'genre', 'category'} <= {event['model'] for event in events}
+
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 7)
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        events, _ = self.read_all(admin_client, after=cursor)
+        assert [
+            (event['model'], event['action']) for event in events
+            if event['model'] in ('review', 'title')
+        ] == [
+            ('review', 'create'),
+            ('title', 'update'),
+            ('title', 'delete'),
+        ], (
+            'Проверьте, что журнал содержит создание отзыва, изменение '
+            'рейтинга и удаление произведения в порядке изменений.'
+        )
+
+    def test_02_rolled_back_changes_are_not_logged(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Genre.objects.create(name='Вестерн', slug='western')
+                raise RuntimeError
+        assert not Change.objects.exists(), (
+            'Проверьте, что запись журнала изменений фиксируется в одной '
+            'транзакции с изменением.'
+        )
+
+    def test_03_invalid_cursor(self, admin_client):
+        response = admin_client.get(self.CHANGES_URL, {'after': 'abc'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_bulk_update_logged_once(self):
+        genres = [
+            Genre.objects.create(name=name, slug=name)
+            for name in ('western', 'noir')
+        ]
+        last_id = Change.objects.latest('id').id
+        for genre in genres:
+            genre.name = genre.name.upper()
+        Genre.objects.bulk_update(genres, ('name',))
+        assert sorted(Change.objects.filter(id__gt=last_id).values_list(
+            'object_id', 'action'
+        )) == sorted((genre.pk, 'update') for genre in genres), (
+            'Проверьте, что bulk_update добавляет в журнал по одной записи '
+            'на изменённый объект.'
+        )
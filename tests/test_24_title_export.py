@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from api import export
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    def get_content(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL}` отдаёт выгрузку потоком.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_ndjson(self, admin_client, monkeypatch):
+        create_comments(admin_client, {})
+        monkeypatch.setattr(export, 'EXPORT_CHUNK_SIZE', 1)
+        expected = admin_client.get('/api/v1/titles/?ordering=id').json()
+        content = self.get_content(admin_client.get(self.EXPORT_URL))
+        titles = [json.loads(line) for line in content.splitlines()]
+        assert sorted(titles, key=lambda title: title['id']) == sorted(
+            expected['results'], key=lambda title: title['id']
+        ), (
+            'Проверьте, что выгрузка NDJSON содержит все произведения '
+            'в том же представлении, что и список произведений.'
+        )
+
+    def test_02_csv(self, admin_client):
+        _, _, titles = create_comments(admin_client, {})
+        response = admin_client.get(
+            self.EXPORT_URL, {'type': 'csv', 'category': 'books'}
+        )
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(self.get_content(response))))
+        assert len(rows) == 1, (
+            'Проверьте, что выгрузка учитывает фильтры списка произведений.'
+        )
+        title = next(
+            title for title in titles if title['category'] == 'books'
+        )
+        assert rows[0]['name'] == title['name']
+        assert sorted(rows[0]['genre'].split(',')) == sorted(title['genre'])
+
+    def test_03_permissions_and_format(self, admin_client, user_client):
+        assert user_client.get(
+            self.EXPORT_URL
+        ).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка произведений доступна только '
+            'администратору.'
+        )
+        assert admin_client.get(
+            self.EXPORT_URL, {'type': 'xml'}
+        ).status_code == HTTPStatus.BAD_REQUEST
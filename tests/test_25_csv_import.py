@@ -0,0 +1,270 @@
+import csv
+from collections import defaultdict
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+from reviews.models import (ApiUser,
+                            Category,
+                            Change,
+                            Comment,
+                            Review,
+                            Title)
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def read_csv(name):
+    with open(DATA_DIR / name, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25CsvImport:
+
+    def run_import(self, *args):
+        output = StringIO()
+        call_command('csv_import', *args, stdout=output)
+        return output.getvalue()
+
+    def test_01_import(self):
+        output = self.run_import('--batch-size', '7')
+        for model, name in (
+            (ApiUser, 'apiuser.csv'),
+            (Title, 'title.csv'),
+            (Review, 'review.csv'),
+            (Comment, 'comment.csv'),
+        ):
+            assert model._default_manager.count() == len(read_csv(name)), (
+                f'Проверьте, что команда `csv_import` загружает все строки '
+                f'файла `{name}`.'
+            )
+        assert 'rows/s' in output, (
+            'Проверьте, что команда `csv_import` сообщает скорость загрузки.'
+        )
+        assert Change.objects.filter(
+            model=Change.Models.REVIEW, action=Change.Actions.CREATE
+        ).count() == Review.objects.count()
+
+        scores = defaultdict(list)
+        for row in read_csv('review.csv'):
+            scores[int(row['title_id'])].append(int(row['score']))
+        for title in Title.objects.all():
+            expected = scores.get(title.pk, [])
+            assert (title.rating_sum, title.rating_count) == (
+                sum(expected), len(expected)
+            ), (
+                'Проверьте, что после загрузки команда `csv_import` '
+                'пересчитывает рейтинги произведений.'
+            )
+
+    def test_02_repeated_import(self):
+        self.run_import()
+        changes = Change.objects.count()
+        output = self.run_import('--verbosity', '2')
+        rows = len(read_csv('review.csv'))
+        assert Review.objects.count() == rows
+        assert (
+            f'review: {rows} rows, 0 inserted, {rows} skipped' in output
+        ), (
+            'Проверьте, что повторная загрузка пропускает объекты '
+            'с существующими id.'
+        )
+        assert 'Object review ID:1 already exists' in output
+        assert Change.objects.count() == changes
+
+    def test_03_data_dir_and_dependencies(self, tmp_path, client):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        (tmp_path / 'title.csv').write_text(
+            'id,name,year,category_id\n'
+            '1,Первое,1994,1\n'
+            '2,Из будущего,3000,1\n'
+            '3,Третье,2000,2\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n2,Книга,book\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'notes.csv').write_text('id\n1\n', encoding='utf-8')
+        output = self.run_import(
+            '--data-dir', str(tmp_path), '--jobs', '2', '--batch-size', '1'
+        )
+        assert set(Title.objects.values_list('pk', flat=True)) == {1, 3}, (
+            'Проверьте, что команда `csv_import` загружает файлы из '
+            '`--data-dir` и пропускает строки, не прошедшие валидацию.'
+        )
+        assert 'Object title ID:2 invalid' in output
+        assert 'File notes.csv skipped' in output
+        assert client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что после загрузки `csv_import` закэшированные '
+            'ответы API обновляются.'
+        )
+        assert Category.objects.count() == 2
+        changes = Change.objects.filter(action=Change.Actions.CREATE)
+        last_category = changes.filter(
+            model=Change.Models.CATEGORY
+        ).latest('id')
+        first_title = changes.filter(model=Change.Models.TITLE).earliest('id')
+        assert last_category.id < first_title.id, (
+            'Проверьте, что файл модели загружается после файлов моделей, '
+            'на которые она ссылается.'
+        )
+
+    def test_04_validation(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8'
+        )
+        (tmp_path / 'title.csv').write_text(
+            'id,name,year,category_id\n'
+            '1,Первое,1994,1\n'
+            '2,Второе,3000,1\n'
+            '3,Третье,2000,5\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'apiuser.csv').write_text(
+            'id,username,email\n1,first,first@yamdb.fake\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author_id,score,pub_date\n'
+            '1,1,"Текст",1,11,2020-01-01T00:00:00Z\n'
+            '2,1,"Текст",1,5,не дата\n'
+            'x,9,"Текст",1,5,2020-01-01T00:00:00Z\n',
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError):
+            self.run_import('--data-dir', str(tmp_path), '--dry-run')
+        output = StringIO()
+        with pytest.raises(CommandError):
+            call_command(
+                'csv_import', '--data-dir', str(tmp_path), '--validate',
+                stdout=output
+            )
+        output = output.getvalue()
+        for message in (
+            'title.csv: year: Invalid year. 1 rows (ID: 2)',
+            'title.csv: category_id: unknown category. 1 rows (ID: 3)',
+            'review.csv: score: Score must be in range 1 - 10. 1 rows (ID: 1)',
+            'review.csv: pub_date: invalid date. 1 rows (ID: 2)',
+            'review.csv: id: not an integer. 1 rows (ID: x)',
+            'review.csv: title_id: unknown title. 1 rows (ID: x)',
+            'review.csv: Duplicate values of author_id, title_id. '
+            '2 rows (ID: 1, 2)',
+        ):
+            assert message in output, (
+                'Проверьте, что `csv_import --validate` сообщает обо всех '
+                f'нарушениях в файлах: нет `{message}`.'
+            )
+        assert not Title.objects.exists(), (
+            'Проверьте, что при нарушениях `csv_import --validate` не '
+            'загружает данные.'
+        )
+
+        (tmp_path / 'review.csv').unlink()
+        (tmp_path / 'title.csv').write_text(
+            'id,name,year,category_id\n1,Первое,1994,1\n', encoding='utf-8'
+        )
+        output = self.run_import('--data-dir', str(tmp_path), '--dry-run')
+        assert 'Validation passed' in output
+        assert not Title.objects.exists(), (
+            'Проверьте, что `csv_import --dry-run` не загружает данные.'
+        )
+        self.run_import('--data-dir', str(tmp_path), '--validate')
+        assert Title.objects.count() == 1
+
+    def test_05_validation_against_db(self, tmp_path):
+        self.run_import()
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author_id,score,pub_date\n'
+            + ''.join(
+                f'{1000 + pk},{pk},"Текст",{author},5,2020-01-01T00:00:00Z\n'
+                for pk, author in enumerate((100, 101, 102, 103, 104), 1)
+            ),
+            encoding='utf-8'
+        )
+        output = self.run_import('--data-dir', str(tmp_path), '--dry-run')
+        assert 'Validation passed' in output, (
+            'Проверьте, что `csv_import --validate` находит объекты, на '
+            'которые ссылается файл, среди уже загруженных в БД.'
+        )
+
+    def test_06_unknown_references(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8'
+        )
+        (tmp_path / 'title.csv').write_text(
+            'id,name,year,category_id\n'
+            '1,Первое,1994,1\n'
+            '2,Второе,1995,5\n'
+            '3,Третье,1996,1\n',
+            encoding='utf-8'
+        )
+        output = self.run_import(
+            '--data-dir', str(tmp_path), '--batch-size', '2'
+        )
+        assert set(Title.objects.values_list('pk', flat=True)) == {1, 3}, (
+            'Проверьте, что `csv_import` пропускает строки со ссылками на '
+            'несуществующие объекты и загружает остальные строки порции.'
+        )
+        assert (
+            'Object title ID:2 invalid: category_id: unknown category.'
+            in output
+        )
+        assert 'title: 3 rows, 2 inserted, 0 skipped, 1 invalid' in output
+
+    def test_07_upsert(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n', encoding='utf-8'
+        )
+        titles = [f'{pk},Фильм {pk},2000,1' for pk in range(1, 6)]
+        title_file = tmp_path / 'title.csv'
+        title_file.write_text(
+            'id,name,year,category_id\n' + '\n'.join(titles) + '\n',
+            encoding='utf-8'
+        )
+        args = ('--data-dir', str(tmp_path), '--upsert', '--batch-size', '2')
+        self.run_import(*args)
+        assert Title.objects.count() == 5
+
+        output = self.run_import(*args)
+        assert 'title: file unchanged' in output, (
+            'Проверьте, что `csv_import --upsert` пропускает файлы, не '
+            'изменившиеся с прошлой загрузки.'
+        )
+
+        last_id = Change.objects.latest('id').id
+        titles[3] = '4,Новое название,2001,1'
+        titles.append('6,Фильм 6,2000,1')
+        title_file.write_text(
+            'id,name,year,category_id\n' + '\n'.join(titles) + '\n',
+            encoding='utf-8'
+        )
+        output = self.run_import(*args)
+        assert (
+            'title: 6 rows, 1 inserted, 1 updated, 4 unchanged, 0 skipped'
+            in output
+        ), (
+            'Проверьте, что `csv_import --upsert` обновляет изменившиеся '
+            'строки и пропускает порции, не изменившиеся с прошлой '
+            'загрузки.'
+        )
+        title = Title.objects.get(pk=4)
+        assert (title.name, title.year) == ('Новое название', 2001)
+        assert title.name_search == 'новое название'
+        assert sorted(Change.objects.filter(
+            id__gt=last_id, model=Change.Models.TITLE
+        ).values_list('object_id', 'action')) == [
+            (4, 'update'), (6, 'create')
+        ]
+
+        output = self.run_import(*args[:-1], '3')
+        assert (
+            'title: 6 rows, 0 inserted, 0 updated, 6 unchanged, 0 skipped'
+            in output
+        ), (
+            'Проверьте, что `csv_import --upsert` считает строки, '
+            'совпавшие с БД, неизменившимися, а не пропущенными.'
+        )
@@ -0,0 +1,85 @@
+import gzip
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import ApiUser, Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CsvExport:
+
+    def run_command(self, name, *args):
+        output = StringIO()
+        call_command(name, *args, stdout=output)
+        return output.getvalue()
+
+    def get_state(self):
+        return {
+            'users': list(ApiUser.objects.order_by('pk').values_list(
+                'pk', 'username', 'email', 'role', 'password'
+            )),
+            'titles': [
+                (
+                    title.pk, title.name, title.year, title.category_id,
+                    title.description, title.rating,
+                    sorted(title.genre.values_list('slug', flat=True))
+                )
+                for title in Title.objects.order_by('pk')
+            ],
+            'reviews': list(Review.objects.order_by('pk').values_list(
+                'pk', 'title_id', 'author_id', 'score', 'text', 'pub_date'
+            )),
+            'comments': list(Comment.objects.order_by('pk').values_list(
+                'pk', 'review_id', 'author_id', 'text', 'pub_date'
+            )),
+        }
+
+    def test_01_round_trip(self, tmp_path):
+        self.run_command('csv_import')
+        Title.objects.filter(pk=1).update(description=None)
+        state = self.get_state()
+        output = self.run_command(
+            'csv_export', '--data-dir', str(tmp_path), '--gzip',
+            '--chunk-size', '7'
+        )
+        assert 'Data export finished for model: title: ' in output
+        assert (tmp_path / 'title.csv.gz').is_file(), (
+            'Проверьте, что команда `csv_export` с `--gzip` пишет файлы '
+            '`<модель>.csv.gz`.'
+        )
+        assert not (tmp_path / 'change.csv.gz').exists(), (
+            'Проверьте, что журнал изменений не выгружается.'
+        )
+        assert not list(tmp_path.glob('.tmp-*'))
+        with gzip.open(tmp_path / 'title.csv.gz', 'rt') as file:
+            assert len(file.readlines()) == Title.objects.count() + 1
+
+        for model in (Comment, Review, Title, Genre, Category, ApiUser):
+            model._base_manager.all().delete()
+        self.run_command('csv_import', '--data-dir', str(tmp_path),
+                         '--validate')
+        assert self.get_state() == state, (
+            'Проверьте, что выгрузка `csv_export` загружается командой '
+            '`csv_import` без потерь.'
+        )
+
+    def test_02_deterministic_output(self, tmp_path):
+        self.run_command('csv_import')
+        for name in ('first', 'second'):
+            self.run_command(
+                'csv_export', '--data-dir', str(tmp_path / name), '--gzip',
+                '--jobs', '2'
+            )
+        first = sorted(path.name for path in (tmp_path / 'first').iterdir())
+        assert first == sorted(
+            path.name for path in (tmp_path / 'second').iterdir()
+        )
+        for name in first:
+            assert (tmp_path / 'first' / name).read_bytes() == (
+                tmp_path / 'second' / name
+            ).read_bytes(), (
+                'Проверьте, что повторная выгрузка тех же данных даёт '
+                'те же файлы.'
+            )